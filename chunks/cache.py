@@ -2,49 +2,118 @@
 """Cache op: wraps downstream op with TTL cache."""
 from __future__ import annotations
 import hashlib
+import heapq
+import itertools
 import time
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
 
 provides = ["ops"]
 requires = []
 
 
-_cache: Dict[str, Any] = {}
-_timestamps: Dict[str, float] = {}
+_MAX_ENTRIES = 1024
+# On overflow, the least-hit of this many least-recently-used entries is evicted.
+_EVICT_SAMPLE = 8
+_seq = itertools.count()
+
+
+class _CacheState:
+    """Cached results for one container.
+
+    entries maps key -> [expires_at, result, hits], least recently used first;
+    size is bounded by _MAX_ENTRIES. Expiry times are time.monotonic_ns() values, so
+    wall-clock adjustments never expire or revive entries. expiry is a min-heap
+    of (expires_at, seq, key) used to purge stale entries from the front; heap
+    items whose entry was since replaced or evicted no longer match entries and
+    are skipped. seq breaks ties so keys of different types are never compared.
+    """
+    __slots__ = ("entries", "expiry")
+
+    def __init__(self) -> None:
+        self.entries: OrderedDict[str | bytes, List[Any]] = OrderedDict()
+        self.expiry: List[Tuple[int, int, str | bytes]] = []
+
+    def purge(self, now: int) -> None:
+        entries, expiry = self.entries, self.expiry
+        while expiry and expiry[0][0] < now:
+            expires_at, _, h = heapq.heappop(expiry)
+            entry = entries.get(h)
+            if entry is not None and entry[0] == expires_at:
+                del entries[h]
+
+    def store(self, h: str | bytes, expires_at: int, res: Dict[str, Any]) -> Dict[str, Any]:
+        entries, expiry = self.entries, self.expiry
+        entries[h] = [expires_at, res, 0]
+        entries.move_to_end(h)
+        heapq.heappush(expiry, (expires_at, next(_seq), h))
+        if len(entries) > _MAX_ENTRIES:
+            self._evict()
+        if len(expiry) > 2 * _MAX_ENTRIES:
+            # drop heap items left behind by refreshes and LRU evictions
+            expiry[:] = [(entry[0], next(_seq), k) for k, entry in entries.items()]
+            heapq.heapify(expiry)
+        return res
+
+    def _evict(self) -> None:
+        # A once-used entry that merely sits at the LRU end goes before an
+        # older one that keeps getting hits; ties fall to the oldest.
+        tail = itertools.islice(self.entries.items(), _EVICT_SAMPLE)
+        victim = min(tail, key=lambda item: item[1][2])[0]
+        del self.entries[victim]
+
+
+def _state(container: Dict[str, Any]) -> _CacheState:
+    state = container.get("_cache_state")
+    if state is None:
+        state = container["_cache_state"] = _CacheState()
+    return state
+
+
+# Prompts shorter than this are used as their own key; hashing them costs
+# more than the dict does.
+_INLINE_KEY_MAX = 64
+
+
+def _key(base: str) -> str | bytes:
+    if len(base) < _INLINE_KEY_MAX:
+        return base
+    # Keys only need to be unique within this process, not cryptographic.
+    return hashlib.blake2b(base.encode(), digest_size=16).digest()
 
 
 def op_cache(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-strategy = config.get("strategy", "off")
-ttl = float(config.get("ttl_seconds", 0))
-base = message.get("prompt") or str(message.get("messages", ""))
-h = hashlib.sha256(base.encode()).hexdigest()
-now = time.time()
-if strategy == "prefer":
-if h in _cache and now - _timestamps.get(h, 0) <= ttl:
-return _cache[h]
-res = _call_child(message, config, container)
-_cache[h] = res
-_timestamps[h] = now
-return res
-if strategy == "refresh":
-res = _call_child(message, config, container)
-_cache[h] = res
-_timestamps[h] = now
-return res
-# off
-return _call_child(message, config, container)
+    strategy = config.get("strategy", "off")
+    ttl_ns = int(float(config.get("ttl_seconds", 0)) * 1_000_000_000)
+    base = message.get("prompt") or str(message.get("messages", ""))
+    h = _key(base)
+    now = time.monotonic_ns()
+    if strategy == "prefer":
+        state = _state(container)
+        state.purge(now)
+        hit = state.entries.get(h)
+        if hit is not None:
+            state.entries.move_to_end(h)
+            hit[2] += 1
+            return hit[1]
+        return state.store(h, now + ttl_ns, _call_child(message, config, container))
+    if strategy == "refresh":
+        return _state(container).store(h, now + ttl_ns, _call_child(message, config, container))
+    # off
+    return _call_child(message, config, container)
 
 
 def _call_child(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-child = config.get("child")
-if not child:
-raise RuntimeError("cache child op not specified in config['child']")
-op = container.get("ops", {}).get(child)
-if not callable(op):
-raise RuntimeError(f"Unknown child op: {child}")
-return op(message, config.get("child_config", {}), container)
+    child = config.get("child")
+    if not child:
+        raise RuntimeError("cache child op not specified in config['child']")
+    op = container.get("ops", {}).get(child)
+    if not callable(op):
+        raise RuntimeError(f"Unknown child op: {child}")
+    return op(message, config.get("child_config", {}), container)
 
 
 def build(container: Dict[str, Any]) -> None:
-container.setdefault("ops", {})["Cache"] = op_cache
+    container.setdefault("ops", {})["Cache"] = op_cache
+    container.setdefault("_cache_state", _CacheState())
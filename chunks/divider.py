@@ -3,7 +3,8 @@ DividerGate chunk: configurable AND/OR routing gate as a VOIDE operation.
 
 Config keys:
   mode: "AND" | "OR" (default: "AND")
-  max_steps: int (default: 100)
+  max_steps: int (default: 100); validated and passed to the Divider, but
+    each op call routes a single packet, so it never trips here
   rules: list[str]  # packet fields that must be truthy
   triggers: list[str]  # named triggers
   trigger_states: dict mapping trigger name to bool
@@ -11,8 +12,8 @@ Config keys:
 Outputs:
   returns a dict with any of the keys 'pass', 'divert', 'trigger' containing the packet routed.
 """
-from future import annotations
-from typing import Any, Dict, List
+from __future__ import annotations
+from typing import Any, Dict, List, Tuple
 
 # Copy of the minimal Divider implementation
 RouteHandler = Any  # in this context, handlers just capture packets
@@ -25,7 +26,7 @@ class Divider:
         if m not in ("AND", "OR"):
             raise ValueError("mode must be 'AND' or 'OR'")
         self.mode: str = m
-        self.rules: List = []
+        self.rules: List[str] = []  # packet fields that must be truthy
         self.triggers: Dict[str, bool] = {}
         self.outputs: Dict[str, RouteHandler] = {}
         self.max_steps: int = max(1, max_steps)
@@ -33,7 +34,7 @@ class Divider:
 
     def add_rule(self, field: str) -> None:
         # rule checks truthiness of a packet field
-        self.rules.append(lambda p, f=field: bool(p.get(f)))
+        self.rules.append(field)
 
     def add_trigger(self, name: str) -> None:
         self.triggers[name] = False
@@ -51,12 +52,22 @@ class Divider:
     def _rules_pass(self, data: Dict[str, Any]) -> bool:
         if not self.rules:
             return True
-        results = (r(data) for r in self.rules)
-        return all(results) if self.mode == "AND" else any(results)
+        # map(dict.get) stays in C and all/any still short-circuit
+        values = map(data.get, self.rules)
+        return all(values) if self.mode == "AND" else any(values)
 
     def _has_trigger(self) -> bool:
         return any(self.triggers.values())
 
+    def _rules_output(self, data: Dict[str, Any]) -> str:
+        return "pass" if self._rules_pass(data) else "divert"
+
+    def select(self, data: Dict[str, Any]) -> str:
+        """Output name for data ('trigger', 'pass' or 'divert'), ignoring connections."""
+        if self._has_trigger():
+            return "trigger"
+        return self._rules_output(data)
+
     def route(self, data: Dict[str, Any]) -> None:
         if self._steps >= self.max_steps:
             if "divert" in self.outputs:
@@ -64,11 +75,11 @@ class Divider:
             return
         self._steps += 1
 
-        if self._has_trigger() and "trigger" in self.outputs:
-            self.outputs["trigger"](data)
-            return
-
-        handler = self.outputs.get("pass") if self._rules_pass(data) else self.outputs.get("divert")
+        name = self.select(data)
+        if name == "trigger" and "trigger" not in self.outputs:
+            # an active trigger with nothing connected falls back to the rules
+            name = self._rules_output(data)
+        handler = self.outputs.get(name)
         if handler:
             handler(data)
 
@@ -76,27 +87,46 @@ class Divider:
 provides = ["ops"]
 requires: List[str] = []
 
-def op_divider_gate(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-    # instantiate or reuse a Divider per op invocation
-    gate = Divider(mode=config.get("mode", "AND"), max_steps=int(config.get("max_steps", 100)))
+GateKey = Tuple[str, int, Tuple[str, ...], Tuple[str, ...], Tuple[bool, ...]]
+
+
+def _gate_key(config: Dict[str, Any]) -> GateKey:
+    triggers = tuple(config.get("triggers", []))
+    states = config.get("trigger_states", {})
+    return (
+        str(config.get("mode", "AND")).upper(),
+        int(config.get("max_steps", 100)),  # bad values raise, as before caching
+        tuple(config.get("rules", [])),
+        triggers,
+        tuple(bool(states.get(t, False)) for t in triggers),
+    )
+
+
+def _build_gate(key: GateKey) -> Divider:
+    mode, max_steps, rules, triggers, states = key
+    gate = Divider(mode=mode, max_steps=max_steps)
     # configure rules
-    for field in config.get("rules", []):
+    for field in rules:
         gate.add_rule(field)
     # configure triggers
-    for trig in config.get("triggers", []):
+    for trig, state in zip(triggers, states):
         gate.add_trigger(trig)
-        if config.get("trigger_states", {}).get(trig, False):
+        if state:
             gate.set_trigger(trig, True)
-    # prepare result capture
-    result: Dict[str, Any] = {}
-    gate.connect_output("pass", lambda pkt: result.update({"pass": pkt}))
-    gate.connect_output("divert", lambda pkt: result.update({"divert": pkt}))
-    gate.connect_output("trigger", lambda pkt: result.update({"trigger": pkt}))
-    # route the message
-    gate.route(message)
-    return result
+    return gate
+
+
+def op_divider_gate(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
+    # Gates are cached per configuration on the container. Each call routes a
+    # single packet, so max_steps can never trip here and the cached gate is
+    # used read-only: no per-call Divider, handler lambdas or step counter.
+    gates: Dict[GateKey, Divider] = container.setdefault("_divider_gates", {})
+    key = _gate_key(config)
+    gate = gates.get(key)
+    if gate is None:
+        gate = gates[key] = _build_gate(key)
+    return {gate.select(message): message}
 
 
 def build(container: Dict[str, Any]) -> None:
     container.setdefault("ops", {})["DividerGate"] = op_divider_gate
-
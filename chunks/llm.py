@@ -1,7 +1,7 @@
 # File: workspace/chunks/llm.py
 """LLM chunk: registers LLM op and default client."""
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, Tuple
 
 
 from voide.llm_client import LLMClient
@@ -11,23 +11,42 @@ provides = ["ops", "llm_client"]
 requires: list[str] = []
 
 
+def _client_for(config: Dict[str, Any], container: Dict[str, Any]) -> Tuple[LLMClient, bool]:
+    """Resolve the client and forward flag for a node config.
+
+    Configured clients are cached on the container by their config items so a
+    node reuses its backend (and, for llama_cpp, its loaded model) instead of
+    constructing a new LLMClient per message.
+    """
+    if not config:
+        client = container.get("llm_client") or LLMClient({})
+        return client, bool(client.config.forward_input_with_response)
+    clients: Dict[Any, Tuple[LLMClient, bool]] = container.setdefault("_llm_clients", {})
+    try:
+        key = tuple(sorted(config.items()))
+        entry = clients.get(key)
+    except TypeError:  # unhashable config values: build uncached
+        key, entry = None, None
+    if entry is None:
+        client = LLMClient(config)
+        entry = (client, bool(client.config.forward_input_with_response))
+        if key is not None:
+            clients[key] = entry
+    return entry
+
+
 def op_llm(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-client: LLMClient | None = container.get("llm_client") if not config else None
-if client is None:
-client = LLMClient(config or {})
-fwd = bool((config or {}).get("forward_input_with_response", getattr(client.config, "forward_input_with_response")))
-if "messages" in message:
-text = client.chat(message["messages"])
-elif "prompt" in message:
-text = client.complete(str(message["prompt"]))
-else:
-text = client.complete(str(message))
-out: Dict[str, Any] = {"completion": text}
-if fwd:
-out["input"] = message
-return out
+    client, fwd = _client_for(config, container)
+    if "messages" in message:
+        text = client.chat(message["messages"])
+    elif "prompt" in message:
+        text = client.complete(str(message["prompt"]))
+    else:
+        text = client.complete(str(message))
+    # One dict display either way; the input is forwarded by reference, not copied.
+    return {"completion": text, "input": message} if fwd else {"completion": text}
 
 
 def build(container: Dict[str, Any]) -> None:
-container.setdefault("ops", {})["LLM"] = op_llm
-container["llm_client"] = LLMClient({"backend": "echo"})
+    container.setdefault("ops", {})["LLM"] = op_llm
+    container["llm_client"] = LLMClient({"backend": "echo"})
@@ -1,6 +1,7 @@
 # File: workspace/chunks/memory.py
 """Memory op: read/write to MemoryStore."""
 from __future__ import annotations
+from functools import partial
 from typing import Any, Dict
 import time
 from voide.storage import MemoryStore
@@ -10,24 +11,26 @@ provides = ["ops", "memory"]
 requires = []
 
 
-def op_memory(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-mode = config.get("mode", "read")
-store: MemoryStore = container.get("memory")
-if store is None:
-store = MemoryStore()
-container["memory"] = store
-if mode == "write":
-key = config.get("key", message.get("id", str(time.time())))
-store.upsert(key, message)
-return {"stored": True, "key": key}
-# read
-query = config.get("query", "")
-k = int(config.get("k", 8))
-results = store.query(query, k)
-return {"results": results}
+def _run(store: MemoryStore, message: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    get = config.get
+    if get("mode", "read") == "write":
+        key = get("key")
+        if key is None:
+            key = message.get("id")
+            if key is None:
+                key = str(time.time())
+        store.upsert(key, message)
+        return {"stored": True, "key": key}
+    # read
+    return {"results": store.query(get("query", ""), int(get("k", 8)))}
+
+
+def _bound_op(store: MemoryStore, message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
+    return _run(store, message, config)
 
 
 def build(container: Dict[str, Any]) -> None:
-container.setdefault("ops", {})["Memory"] = op_memory
-if "memory" not in container:
-container["memory"] = MemoryStore()
+    if "memory" not in container:
+        container["memory"] = MemoryStore()
+    # The store is fixed once built, so bind it instead of looking it up per call.
+    container.setdefault("ops", {})["Memory"] = partial(_bound_op, container["memory"])
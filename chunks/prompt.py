@@ -1,22 +1,43 @@
 # File: workspace/chunks/prompt.py
 """Prompt chunk: registers the Prompt op."""
 from __future__ import annotations
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 
 provides = ["ops"]
 requires: list[str] = []
 
 
+Renderer = Callable[[Dict[str, Any]], str]
+
+# Compiled renderers keyed by template text. A template's renderer depends only
+# on the template, so this is safe to share across containers.
+_renderers: Dict[str, Renderer] = {}
+
+
+def _compile(template: str) -> Renderer:
+    before, sep, after = template.partition("{task}")
+    if not sep:
+        # Static template: nothing to substitute.
+        return lambda message: template
+    if "{task}" not in after:
+        # Single placeholder: splice between the precomputed halves.
+        return lambda message: before + str(message.get("task", "")) + after
+    return lambda message: template.replace("{task}", str(message.get("task", "")))
+
+
 def _render(template: str, message: Dict[str, Any]) -> str:
-# Minimal replacement: {task}
-return template.replace("{task}", str(message.get("task", "")))
+    # Minimal replacement: {task}
+    renderer = _renderers.get(template)
+    if renderer is None:
+        renderer = _renderers[template] = _compile(template)
+    return renderer(message)
 
 
 def op_prompt(message: Dict[str, Any], config: Dict[str, Any], container: Dict[str, Any]) -> Dict[str, Any]:
-template = config.get("template", "{task}")
-return {"prompt": _render(template, message)}
+    template = config.get("template", "{task}")
+    return {"prompt": _render(template, message)}
 
 
 def build(container: Dict[str, Any]) -> None:
-container.setdefault("ops", {})["Prompt"] = op_prompt
+    container.setdefault("ops", {})["Prompt"] = op_prompt
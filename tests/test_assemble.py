@@ -65,3 +65,17 @@ def build(container):
         msg = str(e)
         assert "X" in msg
 
+
+def test_load_module_reuses_until_file_changes(tmp_path):
+    from voide.chunk_api import clear_module_cache, load_module
+
+    p = write_chunk(tmp_path, "mod", "VALUE = 1\n")
+    first = load_module(p)
+    assert load_module(p) is first  # same mtime and size: not executed again
+
+    p.write_text("VALUE = 22\n")  # size changes, so the edit is picked up
+    edited = load_module(p)
+    assert edited is not first and edited.VALUE == 22
+
+    clear_module_cache()
+    assert load_module(p) is not edited
@@ -0,0 +1,35 @@
+from voide.chunks.divider import op_divider_gate
+
+def test_divider_routes_by_rules():
+    c = {}
+    cfg = {"mode": "AND", "rules": ["ok", "ready"]}
+    assert op_divider_gate({"ok": 1, "ready": 1}, cfg, c) == {"pass": {"ok": 1, "ready": 1}}
+    assert op_divider_gate({"ok": 1}, cfg, c) == {"divert": {"ok": 1}}
+    cfg_or = {"mode": "or", "rules": ["ok", "ready"]}
+    assert "pass" in op_divider_gate({"ok": 1}, cfg_or, c)
+
+def test_divider_trigger_and_reuse():
+    c = {}
+    cfg = {"triggers": ["stop"], "trigger_states": {"stop": True}}
+    assert op_divider_gate({"x": 1}, cfg, c) == {"trigger": {"x": 1}}
+    # well past the default max_steps: a cached gate must not start diverting
+    for _ in range(150):
+        assert "pass" in op_divider_gate({"x": 1}, {"rules": ["x"]}, c)
+    assert len(c["_divider_gates"]) == 2
+
+def test_divider_route_matches_select():
+    from voide.chunks.divider import Divider
+    got = []
+    d = Divider(mode="AND")
+    d.add_rule("ok")
+    d.add_trigger("stop")
+    d.connect_output("pass", lambda pkt: got.append("pass"))
+    d.connect_output("divert", lambda pkt: got.append("divert"))
+    d.route({"ok": 1})
+    d.route({})
+    d.set_trigger("stop")
+    d.route({"ok": 1})  # trigger active but unconnected: rules decide
+    d.connect_output("trigger", lambda pkt: got.append("trigger"))
+    d.route({"ok": 1})
+    assert got == ["pass", "divert", "pass", "trigger"]
+    assert d.select({"ok": 1}) == "trigger"
@@ -21,6 +21,8 @@ def test_topo_sort_cycle():
     g.add_edge(Edge("b", "out", "a", "in"))
     with pytest.raises(CycleError):
         g.topo_sort()
+    with pytest.raises(CycleError):
+        compile(g, {"ops": {"A": lambda m, c, ct: {}, "B": lambda m, c, ct: {}}})
 
 def test_runner_simple_chain():
     def op_a(msg, cfg, c): return {"x": msg.get("x", 0) * 2}
@@ -49,3 +51,36 @@ def test_runner_fan_in_fan_out():
     out = runner.run({})
     assert out["c"]["sum"] == 7
 
+
+def test_runner_source_payload_shared_unless_copied():
+    seen = []
+    container = {"ops": {"S": lambda msg, cfg, c: seen.append(msg) or {}}}
+    g = Graph()
+    g.add_node(Node(id="s1", type_name="S", config={}))
+    g.add_node(Node(id="s2", type_name="S", config={}))
+    payload = {"task": "t"}
+    compile(g, container).run(payload)
+    assert seen[0] is payload and seen[1] is payload
+    seen.clear()
+    compile(g, container, copy_payload=True).run(payload)
+    assert seen[0] == payload and seen[0] is not payload and seen[1] is not seen[0]
+
+def test_runner_parallel_levels():
+    import threading
+    barrier = threading.Barrier(2, timeout=5)
+    def op_wait(msg, cfg, c):
+        barrier.wait()  # only returns if both sources run at the same time
+        return {"v": cfg["v"]}
+    def op_sum(msg, cfg, c): return {"sum": msg["a"] + msg["b"]}
+    container = {"ops": {"W": op_wait, "S": op_sum}}
+    g = Graph()
+    g.add_node(Node(id="w1", type_name="W", config={"v": 1}))
+    g.add_node(Node(id="w2", type_name="W", config={"v": 2}))
+    g.add_node(Node(id="s", type_name="S", config={}))
+    g.add_edge(Edge("w1", "v", "s", "a"))
+    g.add_edge(Edge("w2", "v", "s", "b"))
+    with compile(g, container, parallel=True, max_workers=2) as runner:
+        out = runner.run({})
+    assert runner._executor is None
+    assert list(out) == ["w1", "w2", "s"]
+    assert out["s"]["sum"] == 3
@@ -15,3 +15,85 @@ def test_fallback_when_backend_missing():
     out2 = c2.complete("hi2")
     assert out2.startswith("ECHO:")
 
+
+def test_echo_async_gather():
+    import asyncio
+    c = LLMClient({"backend": "echo"})
+    async def main():
+        return await asyncio.gather(c.acomplete("a"), c.achat([{"role": "user", "content": "b"}]))
+    assert asyncio.run(main()) == ["ECHO: a", "ECHO: b"]
+
+def test_batch_complete_packs_prompts(monkeypatch):
+    c = LLMClient({"backend": "echo", "marshal_batch_size": 2})
+    assert c.batch_complete(["a", "b", "c"]) == ["ECHO: a", "ECHO: b", "ECHO: c"]
+    assert c.batch_complete(["1. x\n2. y", "z"]) == ["ECHO: 1. x\n2. y", "ECHO: z"]
+
+    from voide.llm_client import _BATCH_HEADER, EchoAdapter
+
+    packed = _BATCH_HEADER + "<<1>>how to cook pasta?<</1>>\n<<2>>capital of France?<</2>>"
+    replies = {}
+
+    class FakeAdapter(EchoAdapter):
+        def __init__(self, model):
+            pass
+        def complete(self, prompt, max_tokens=None):
+            return replies[prompt] if prompt == packed else "single:" + prompt
+
+    monkeypatch.setattr("voide.llm_client.OpenAIAdapter", FakeAdapter)
+    c = LLMClient({"backend": "openai"}, fallback_to_echo=False)
+    prompts = ["how to cook pasta?", "capital of France?"]
+    # nested numbering inside an answer stays with that answer
+    replies[packed] = "<<1>>Steps:\n1. boil water\n2. add pasta<</1>>\n<<2>>Paris<</2>>"
+    assert c.batch_complete(prompts) == ["Steps:\n1. boil water\n2. add pasta", "Paris"]
+    # a plain numbered reply has no markers: fall back to one request per prompt
+    replies[packed] = "1. Steps:\n   1. boil water\n   2. add pasta\n2. Paris"
+    assert c.batch_complete(prompts) == ["single:" + p for p in prompts]
+    # out-of-order or repeated markers are rejected too
+    replies[packed] = "<<2>>Paris<</2>><<1>>boil<</1>>"
+    assert c.batch_complete(prompts) == ["single:" + p for p in prompts]
+    replies[packed] = "<<1>>a<</1>><<1>>b<</1>><<2>>Paris<</2>>"
+    assert c.batch_complete(prompts) == ["single:" + p for p in prompts]
+
+def test_llama_cpp_context_pool(tmp_path, monkeypatch):
+    import sys
+    import threading
+    import time
+    import types
+
+    class FakeLlama:
+        instances = []
+        def __init__(self, model_path):
+            self.resets = 0
+            self.busy = False
+            FakeLlama.instances.append(self)
+        def __call__(self, prompt, max_tokens=None):
+            assert not self.busy  # never lent to two callers at once
+            self.busy = True
+            gate.wait(timeout=5)
+            self.busy = False
+            return {"choices": [{"text": prompt}]}
+        def reset(self):
+            self.resets += 1
+
+    gate = threading.Event()
+    gate.set()
+    monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=FakeLlama))
+    model = tmp_path / "m.gguf"
+    model.touch()
+    c = LLMClient({"backend": "llama_cpp", "model_path": str(model), "n_ctx_slots": 2}, fallback_to_echo=False)
+    assert c.complete("a") == "a" and c.complete("b") == "b"
+    assert len(FakeLlama.instances) == 1  # sequential calls reuse the returned context
+    assert FakeLlama.instances[0].resets == 2
+
+    gate.clear()  # hold both calls so they must run on separate contexts
+    threads = [threading.Thread(target=c.complete, args=(p,)) for p in "xy"]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while sum(inst.busy for inst in FakeLlama.instances) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(FakeLlama.instances) == 2
+    assert all(inst.resets >= 1 and not inst.busy for inst in FakeLlama.instances)
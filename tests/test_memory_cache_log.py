@@ -11,9 +11,71 @@ def test_memory_store(tmp_path, monkeypatch):
     row = ms.get("k1")
     assert row["val"] == 1
     # advance time beyond TTL
-    monkeypatch.setattr(time, "time", lambda: time.time() + 10)
+    real_time = time.time
+    monkeypatch.setattr("voide.storage.time.time", lambda: real_time() + 10)
     assert ms.get("k1", ttl=1) is None
 
+def test_memory_store_expires_at(tmp_path):
+    from voide.storage import MemoryStore
+    ms = MemoryStore(str(tmp_path / "mem.db"))
+    ms.upsert("gone", {"val": 1}, ttl=0)
+    ms.upsert("kept", {"val": 2}, ttl=60)
+    assert ms.get("gone") is None
+    assert ms.get("kept") == {"val": 2}
+    assert ms.query("val") == [{"val": 2}]
+    assert ms.purge_expired() == 1
+
+def test_memory_store_upsert_many(tmp_path):
+    from voide.storage import MemoryStore
+    ms = MemoryStore(str(tmp_path / "mem.db"))
+    assert ms.upsert_many((f"k{i}", {"i": i}) for i in range(3)) == 3
+    assert ms.get("k2") == {"i": 2}
+
+def test_memory_store_and_log_accept_big_ints(tmp_path):
+    # values json can encode stay storable with orjson installed
+    from voide.storage import JSONLog, MemoryStore
+    ms = MemoryStore(str(tmp_path / "mem.db"))
+    ms.upsert("big", {"n": 2**70})
+    assert ms.get("big") == {"n": 2**70}
+    log = JSONLog(str(tmp_path / "run.log"))
+    log.append({"n": 2**70})
+    log.close()
+    assert json.loads((tmp_path / "run.log").read_text())["n"] == 2**70
+
+def test_memory_store_get_cache_sees_writes(tmp_path):
+    from voide.storage import MemoryStore
+    db = str(tmp_path / "mem.db")
+    a, b = MemoryStore(db), MemoryStore(db)
+    a.upsert("k", {"v": 1})
+    assert a.get("k") == {"v": 1}
+    b.upsert("k", {"v": 2})  # same file: shares a's row cache
+    assert a.get("k") == {"v": 2}
+    a.get("k")["v"] = 99  # callers get their own copy
+    assert a.get("k") == {"v": 2}
+
+def test_memory_store_reopens_recreated_file(tmp_path):
+    from voide.storage import MemoryStore
+    db = tmp_path / "mem.db"
+    ms = MemoryStore(str(db))
+    ms.upsert("k", {"v": 1})
+    assert ms.get("k") == {"v": 1}
+    ms.close()
+    for f in tmp_path.glob("mem.db*"):
+        f.unlink()
+    fresh = MemoryStore(str(db))
+    assert db.exists()
+    assert fresh.get("k") is None
+
+def test_memory_store_query_full_text(tmp_path):
+    from voide.storage import MemoryStore
+    ms = MemoryStore(str(tmp_path / "mem.db"))
+    ms.upsert("a", {"text": "running dogs"})
+    ms.upsert("b", {"text": "sleeping cats"})
+    ms.upsert("a", {"text": "running cats"})  # update re-indexes the row
+    assert ms.query("dogs") == []
+    assert ms.query("run") == [{"text": "running cats"}]
+    assert len(ms.query("cats")) == 2
+
 def test_cache_op(tmp_path):
     from voide.chunks.cache import op_cache
     c = {"ops": {"Child": lambda m, cfg, ct: {"x": 1}}}
@@ -26,6 +88,53 @@ def test_cache_op(tmp_path):
     out3 = op_cache(msg, cfg, c)
     assert out3 is not out2
 
+def test_cache_op_state_per_container():
+    from voide.chunks.cache import op_cache
+    cfg = {"strategy": "prefer", "ttl_seconds": 5, "child": "Child", "child_config": {}}
+    c1 = {"ops": {"Child": lambda m, cfg, ct: {"x": 1}}}
+    c2 = {"ops": {"Child": lambda m, cfg, ct: {"x": 2}}}
+    assert op_cache({"prompt": "p"}, cfg, c1) == {"x": 1}
+    assert op_cache({"prompt": "p"}, cfg, c2) == {"x": 2}
+
+def test_cache_op_evicts_least_hit_tail_entry():
+    from voide.chunks import cache
+    cfg = {"strategy": "prefer", "ttl_seconds": 60, "child": "Child", "child_config": {}}
+    c = {"ops": {"Child": lambda m, cfg, ct: {"p": m["prompt"]}}}
+    for _ in range(4):  # stored once, then hit three times
+        cache.op_cache({"prompt": "hot"}, cfg, c)
+    for i in range(cache._MAX_ENTRIES - 1):
+        cache.op_cache({"prompt": f"k{i}"}, cfg, c)
+    entries = c["_cache_state"].entries
+    assert next(iter(entries)) == "hot"  # least recently used, but often hit
+    cache.op_cache({"prompt": "new"}, cfg, c)
+    assert len(entries) == cache._MAX_ENTRIES
+    assert "hot" in entries
+    assert "k0" not in entries  # once-used entry in the LRU tail goes first
+
+def test_cache_op_expires_on_monotonic_clock(monkeypatch):
+    from voide.chunks import cache
+    calls = []
+    cfg = {"strategy": "prefer", "ttl_seconds": 5, "child": "Child", "child_config": {}}
+    c = {"ops": {"Child": lambda m, cfg, ct: calls.append(m["prompt"]) or {"n": len(calls)}}}
+    now = [10**12]
+    monkeypatch.setattr("voide.chunks.cache.time.monotonic_ns", lambda: now[0])
+    assert cache.op_cache({"prompt": "p"}, cfg, c) == {"n": 1}
+    assert cache.op_cache({"prompt": "p"}, cfg, c) == {"n": 1}
+    now[0] += 6 * 1_000_000_000  # past ttl_seconds
+    cache.op_cache({"prompt": "q"}, cfg, c)
+    assert "p" not in c["_cache_state"].entries  # purged by the next lookup
+    assert cache.op_cache({"prompt": "p"}, cfg, c) == {"n": 3}
+    assert calls == ["p", "q", "p"]
+
+def test_cache_op_compacts_expiry_heap():
+    from voide.chunks import cache
+    cfg = {"strategy": "refresh", "ttl_seconds": 60, "child": "Child", "child_config": {}}
+    c = {"ops": {"Child": lambda m, cfg, ct: {}}}
+    for _ in range(2 * cache._MAX_ENTRIES + 1):  # each refresh leaves a stale heap item
+        cache.op_cache({"prompt": "p"}, cfg, c)
+    state = c["_cache_state"]
+    assert len(state.expiry) == len(state.entries) == 1
+
 def test_log_op(tmp_path):
     from voide.chunks.log import op_log
     logf = tmp_path / "l.jsonl"
@@ -38,3 +147,15 @@ def test_log_op(tmp_path):
     rec = json.loads(lines[0])
     assert rec["a"] == 1 and "timestamp" in rec
 
+def test_json_log_buffered(tmp_path):
+    from voide.storage import JSONLog
+    logf = tmp_path / "sub" / "b.jsonl"
+    log = JSONLog(str(logf), buffer_size=1 << 16)
+    log.append({"n": 1})
+    log.append({"n": 2})
+    assert not logf.exists()
+    log.flush()
+    assert [json.loads(l)["n"] for l in logf.read_text().splitlines()] == [1, 2]
+    log.append({"n": 3})
+    log.close()
+    assert len(logf.read_text().splitlines()) == 3
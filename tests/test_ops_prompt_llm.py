@@ -16,6 +16,14 @@ def test_prompt_renders():
     out = op(msg, cfg, c)
     assert out["prompt"] == "Summarize reverse a string"
 
+def test_prompt_static_and_repeated_placeholders():
+    c = make_container()
+    build_prompt(c)
+    op = c["ops"]["Prompt"]
+    assert op({"task": "x"}, {"template": "no placeholder"}, c)["prompt"] == "no placeholder"
+    out = op({"task": "x"}, {"template": "{task} and {task}"}, c)
+    assert out["prompt"] == "x and x"
+
 def test_llm_echo_completion():
     c = make_container()
     build_llm(c)
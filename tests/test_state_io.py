@@ -18,3 +18,12 @@ def test_state_save_load(tmp_path: Path):
     assert set(g2.nodes.keys()) == {"a", "b"}
     assert len(g2.edges) == 1
     assert pos2["a"] == (100, 120) and pos2["b"] == (260, 120)
+
+def test_state_save_load_json_edge_values(tmp_path: Path):
+    # whatever json.dumps accepted must still save with orjson installed
+    g = Graph()
+    g.add_node(Node(id="d", type_name="Divider", config={"mapping": {1: "A"}, "big": 2**70}))
+    p = tmp_path / "g.json"
+    save_graph(str(p), g, {})
+    g2, _ = load_graph(str(p))
+    assert g2.nodes["d"].config == {"mapping": {"1": "A"}, "big": 2**70}
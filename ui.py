@@ -1,4 +1,5 @@
 # write_step6_ui.py
+import sys
 from pathlib import Path
 
 files = {
@@ -613,9 +614,17 @@ def test_state_save_load(tmp_path: Path):
 """,
 }
 
+written = []
 for path, content in files.items():
     p = Path(path)
+    data = content.encode("utf-8")
+    # leave identical files alone so their mtimes survive and editors/tools
+    # watching them see no spurious change
+    if p.exists() and p.read_bytes() == data:
+        continue
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(content, encoding="utf-8")
-    print("[write]", p)
+    p.write_bytes(data)
+    written.append(f"[write] {p}")
+if written:
+    sys.stdout.write("\n".join(written) + "\n")
 
@@ -7,6 +7,7 @@ then calls build(container) for each in topological order.
 from __future__ import annotations
 
 from pathlib import Path
+from types import ModuleType
 from typing import Dict, Iterable, List, Tuple
 
 from .chunk_api import (
@@ -18,7 +19,30 @@ from .chunk_api import (
     validate_and_meta,
 )
 
-def assemble(chunks_glob: str = "workspace/chunks/*.py", config: Dict | None = None) -> Dict:
+DEFAULT_CHUNKS_GLOB = "workspace/chunks/*.py"
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+# chunks_glob -> (signature of the matched files, build order). Rebuilding from
+# unchanged files reuses the loaded modules instead of importing them again;
+# build() still runs against each new container.
+_ASSEMBLE_CACHE: Dict[str, Tuple[Signature, List[Tuple[ModuleType, ChunkMeta]]]] = {}
+
+
+def _signature(files: Iterable[Path]) -> Signature:
+    sig = []
+    for p in files:
+        st = p.stat()
+        sig.append((str(p), st.st_mtime_ns, st.st_size))
+    return tuple(sig)
+
+
+def chunks_signature(chunks_glob: str = DEFAULT_CHUNKS_GLOB) -> Signature:
+    """(path, mtime_ns, size) of every file matched by chunks_glob; changes when any chunk does."""
+    return _signature(scan_chunk_files(chunks_glob))
+
+
+def assemble(chunks_glob: str = DEFAULT_CHUNKS_GLOB, config: Dict | None = None) -> Dict:
     """Assemble a container from chunk files.
 
     Args:
@@ -31,19 +55,20 @@ def assemble(chunks_glob: str = "workspace/chunks/*.py", config: Dict | None = N
     container: Dict = {"config": dict(config or {}), "ops": {}, "tools": {}}
 
     files = scan_chunk_files(chunks_glob)
-    modules_meta: List[Tuple[object, ChunkMeta]] = []
-    for p in files:
-        if Path(p).name.startswith("_"):
-            try:
-                mod = load_module(Path(p))
-                meta = validate_and_meta(mod, Path(p))
-            except Exception:
-                continue
-        mod = load_module(Path(p))
-        meta = validate_and_meta(mod, Path(p))
-        modules_meta.append((mod, meta))
-
-    ordered = topo_order(modules_meta, initial_keys=container.keys())
+    sig = _signature(files)
+    cached = _ASSEMBLE_CACHE.get(chunks_glob)
+    if cached is not None and cached[0] == sig:
+        ordered = cached[1]
+    else:
+        modules_meta: List[Tuple[object, ChunkMeta]] = []
+        for p in files:
+            if p.name.startswith("_"):
+                continue  # private helpers, not chunks
+            mod = load_module(p)
+            modules_meta.append((mod, validate_and_meta(mod, p)))
+
+        ordered = topo_order(modules_meta, initial_keys=container.keys())
+        _ASSEMBLE_CACHE[chunks_glob] = (sig, ordered)
 
     for mod, meta in ordered:
         mod.build(container)  # type: ignore[attr-defined]
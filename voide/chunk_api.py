@@ -10,11 +10,17 @@ All wiring happens inside build(). Import-time side effects are discouraged.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import glob
+import hashlib
+import heapq
+import os
+import re
+import sys
+from dataclasses import dataclass, field
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
 from types import ModuleType
-from typing import Iterable, List, Tuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
 
 
 class ChunkLoadError(RuntimeError):
@@ -31,31 +37,66 @@ class UnresolvedDependenciesError(RuntimeError):
         super().__init__(f"Unresolved dependencies: {missing}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ChunkMeta:
     path: Path
     provides: Tuple[str, ...]
     requires: Tuple[str, ...]
+    # set views of the tuples above, for dependency resolution
+    provides_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    requires_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "provides_set", frozenset(self.provides))
+        object.__setattr__(self, "requires_set", frozenset(self.requires))
+
+
+# absolute path -> (st_mtime_ns, st_size, module) of the last load
+_module_cache: Dict[Path, Tuple[int, int, ModuleType]] = {}
+
+
+def clear_module_cache() -> None:
+    """Make the next load_module() execute every file again, even if unchanged."""
+    _module_cache.clear()
 
 
 def load_module(path: Path) -> ModuleType:
     """Safely load a module from a file path without adding to sys.path.
 
-    The module name is derived from the filename stem and a short hash of the path
-    to avoid collisions if loaded multiple times from different locations.
+    The module name is derived from the filename stem and a blake2b digest of the
+    absolute path, so it is stable across processes and distinct per location.
+    Relative paths are resolved; absolute ones (as scan_chunk_files returns for
+    absolute patterns) are used as given, without a realpath() walk per call.
+    The module is registered in sys.modules under that name while it executes.
+    Loading a file again while its mtime and size are unchanged returns the
+    module from the previous load instead of executing the file again.
     """
-    path = path.resolve()
-    if not path.exists():
-        raise ChunkLoadError(f"Missing module file: {path}")
-    name = f"voide_chunk_{path.stem}{abs(hash(str(path))) & 0xFFFF:X}"
+    if not path.is_absolute():
+        path = path.resolve()
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        raise ChunkLoadError(f"Missing module file: {path}") from None
+    cached = _module_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    digest = hashlib.blake2b(str(path).encode("utf-8"), digest_size=8).hexdigest()
+    name = f"voide_chunk_{path.stem}_{digest}"
     spec = spec_from_file_location(name, str(path))
     if spec is None or spec.loader is None:
         raise ChunkLoadError(f"Cannot create spec for: {path}")
     mod = module_from_spec(spec)
+    previous = sys.modules.get(name)
+    sys.modules[name] = mod
     try:
         spec.loader.exec_module(mod)  # type: ignore[assignment]
     except Exception as e:
+        if previous is not None:
+            sys.modules[name] = previous
+        else:
+            del sys.modules[name]
         raise ChunkLoadError(f"Error importing {path}: {e}") from e
+    _module_cache[path] = (st.st_mtime_ns, st.st_size, mod)
     return mod
 
 
@@ -81,31 +122,80 @@ def validate_and_meta(mod: ModuleType, path: Path) -> ChunkMeta:
     return ChunkMeta(path=path, provides=tuple(provides), requires=tuple(requires))
 
 
+_MAGIC = re.compile(r"[*?\[]")
+
+
+def _scan_dir(root: str, suffix: str, recursive: bool) -> Iterator[Path]:
+    # DirEntry.is_file() reuses the type scandir already read; no extra stat.
+    # Symlinked directories are not descended into, as with Path.glob, so a
+    # link cycle cannot make '**' loop forever.
+    dirs = [root]
+    while dirs:
+        d = dirs.pop()
+        with os.scandir(d or ".") as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.name.endswith(suffix) and entry.is_file():
+                    yield Path(os.path.join(d, entry.name))
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    dirs.append(os.path.join(d, entry.name))
+
+
 def scan_chunk_files(glob_pattern: str) -> List[Path]:
-    return sorted(Path().glob(glob_pattern))
+    """Sorted files matching glob_pattern (relative or absolute).
+
+    The common 'dir/*.ext' and 'dir/**/*.ext' shapes are listed with
+    os.scandir; any other pattern goes through glob.glob.
+    """
+    head, tail = os.path.split(glob_pattern)
+    recursive = os.path.basename(head) == "**"
+    if recursive:
+        head = os.path.dirname(head)
+    if tail.startswith("*") and not _MAGIC.search(tail, 1) and not _MAGIC.search(head):
+        files = list(_scan_dir(head, tail[1:], recursive)) if os.path.isdir(head or ".") else []
+    else:
+        files = [Path(p) for p in glob.glob(glob_pattern, recursive=True)]
+    files.sort()
+    return files
 
 
 def topo_order(mods: List[Tuple[ModuleType, ChunkMeta]], initial_keys: Iterable[str]) -> List[Tuple[ModuleType, ChunkMeta]]:
     """Return a buildable order or raise UnresolvedDependenciesError.
 
-    We do a simple Kahn-like loop using the container keys as the available set.
+    Kahn's algorithm over provided keys: each module counts the required keys
+    not yet available, and building a module releases its consumers. Ready
+    modules are built in their original (file) order.
     """
     available = set(initial_keys)
-    pending = list(mods)
+    waiting: List[int] = []  # per module: number of required keys still unavailable
+    consumers: Dict[str, List[int]] = {}
+    ready: List[int] = []
+    for i, (_, meta) in enumerate(mods):
+        missing = meta.requires_set - available
+        waiting.append(len(missing))
+        for key in missing:
+            consumers.setdefault(key, []).append(i)
+        if not missing:
+            ready.append(i)
+
     ordered: List[Tuple[ModuleType, ChunkMeta]] = []
-    last_len = None
-    while pending and last_len != len(pending):
-        last_len = len(pending)
-        for pair in list(pending):
-            mod, meta = pair
-            if set(meta.requires).issubset(available):
-                ordered.append(pair)
-                available.update(meta.provides)
-                pending.remove(pair)
-    if pending:
-        missing: dict[str, set[str]] = {}
-        for m, meta in pending:
-            missing[str(meta.path)] = set(meta.requires) - set(available)
-        raise UnresolvedDependenciesError(missing)
+    while ready:
+        i = heapq.heappop(ready)
+        ordered.append(mods[i])
+        for key in mods[i][1].provides_set:
+            if key in available:
+                continue
+            available.add(key)
+            for j in consumers.pop(key, ()):
+                waiting[j] -= 1
+                if not waiting[j]:
+                    heapq.heappush(ready, j)
+
+    if len(ordered) != len(mods):
+        missing_by_path: dict[str, set[str]] = {}
+        for (m, meta), n in zip(mods, waiting):
+            if n:
+                missing_by_path[str(meta.path)] = set(meta.requires_set - available)
+        raise UnresolvedDependenciesError(missing_by_path)
     return ordered
-
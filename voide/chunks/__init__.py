@@ -0,0 +1,26 @@
+"""Importable view of the top-level ``chunks/`` directory.
+
+``assemble()`` loads chunk files straight from a glob, but tests and tools want
+``from voide.chunks.cache import op_cache``. Pointing this package's
+``__path__`` at ``chunks/`` lets the regular import system load each
+``chunks/<name>.py`` once per process as ``voide.chunks.<name>``; every later
+import is served from ``sys.modules`` instead of re-executing the file.
+"""
+from __future__ import annotations
+
+import importlib
+from pathlib import Path
+from types import ModuleType
+
+CHUNKS_DIR = Path(__file__).resolve().parents[2] / "chunks"
+
+__path__.append(str(CHUNKS_DIR))  # type: ignore[name-defined]
+
+__all__ = sorted(p.stem for p in CHUNKS_DIR.glob("*.py") if not p.name.startswith("_"))
+
+
+def __getattr__(name: str) -> ModuleType:
+    # `voide.chunks.llm` without a prior `import voide.chunks.llm`
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,54 +1,231 @@
 """Compile a Graph into a Runner and execute messages."""
 from __future__ import annotations
-from typing import Any, Dict, List
+import sys
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
 
-from voide.graph import Graph, Edge
+from voide.graph import Graph, Node, Edge
 from voide.errors import CycleError
 
+Op = Callable[[Dict[str, Any], Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+Reader = Callable[[Dict[str, Any]], Any]
+# (source plan index, target port, reader of the source's output)
+Input = Tuple[int, str, Reader]
+
+_MISSING = object()
+_EMPTY: Dict[str, Any] = {}
+
+
+def _kahn(nodes: Dict[str, Node], edges: List[Edge]) -> List[Node]:
+    """Nodes in dependency order, or CycleError.
+
+    Same order as Graph.topo_sort (ready nodes in insertion order, FIFO), but
+    with indegree counts and an adjacency list instead of rescanning every
+    edge for each node taken.
+    """
+    indegree: Dict[str, int] = dict.fromkeys(nodes, 0)
+    adj: Dict[str, List[str]] = {}
+    for e in edges:
+        indegree[e.to_node] += 1
+        adj.setdefault(e.from_node, []).append(e.to_node)
+
+    ready = deque(nid for nid, n in indegree.items() if not n)
+    ordered: List[Node] = []
+    while ready:
+        nid = ready.popleft()
+        ordered.append(nodes[nid])
+        for tgt in adj.get(nid, ()):
+            indegree[tgt] -= 1
+            if not indegree[tgt]:
+                ready.append(tgt)
+
+    if len(ordered) != len(nodes):
+        raise CycleError("Graph has cycles or missing dependencies")
+    return ordered
+
+
+def _port_reader(port: str) -> Reader:
+    """Build the accessor for one edge's source port.
+
+    The port's own key wins; an op that returned a single value feeds it to
+    the edge whatever it was named. Anything else is _MISSING.
+    """
+    def read(prev: Dict[str, Any]) -> Any:
+        if port in prev:
+            return prev[port]
+        if len(prev) == 1:
+            for value in prev.values():
+                return value
+        return _MISSING
+    return read
+
+
+
+# (node id, node, op, inputs, single-input passthrough)
+PlanItem = Tuple[str, Node, Op, List[Input], bool]
+Results = List[Dict[str, Any]]
+
+
 class Runner:
-    def __init__(self, graph: Graph, container: Dict[str, Any]) -> None:
+    """Executes a compiled graph, one message per run() call.
+
+    Source nodes (no incoming edges) receive the run() payload itself rather
+    than a copy per node; ops must treat their input message as read-only and
+    build a new dict to change it. Pass copy_payload=True to give each source
+    node its own copy instead.
+
+    With parallel=True, nodes on the same topological level (none feeds
+    another) run concurrently on a thread pool of up to max_workers threads.
+    This suits I/O-bound ops such as remote LLM calls; the ops of one level
+    must then be safe to call together on the shared container. The pool is
+    started on first use; close() it, or use the Runner as a context manager.
+    """
+    __slots__ = (
+        "graph", "container", "copy_payload", "parallel", "max_workers",
+        "_plan", "_ids", "_levels", "_executor", "__weakref__",
+    )
+
+    def __init__(
+        self,
+        graph: Graph,
+        container: Dict[str, Any],
+        copy_payload: bool = False,
+        parallel: bool = False,
+        max_workers: int | None = None,
+    ) -> None:
         self.graph = graph
         self.container = container
+        self.copy_payload = copy_payload
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self._plan: List[PlanItem] = []
+        self._ids: List[str] = []
+        self._levels: List[List[int]] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Re-plan after the graph or the container's ops changed.
+
+        The execution order, each node's op and a reader per incoming edge are
+        resolved here once, so run() is a straight walk over the plan. A node
+        fed by exactly one edge also receives every key of its source's output
+        (the edge's own port taking precedence); fan-in nodes see only their
+        ports. A cyclic graph raises CycleError here rather than on run().
+
+        Inputs refer to their source by plan position, so run() keeps results
+        in a list and looks sources up by index; node ids only key the dict it
+        returns. Node ids and port names in the plan are interned.
+        """
+        self._plan = []
+        self._ids = []
+        self._levels = []
+        # topologically sort nodes (raises CycleError if cyclic)
+        nodes = _kahn(self.graph.nodes, self.graph.edges)
         # map node->incoming edges
-        self._in_edges: Dict[str, List[Edge]] = {}
-        for e in graph.edges:
-            self._in_edges.setdefault(e.to_node, []).append(e)
+        in_edges_of: Dict[str, List[Edge]] = {}
+        for e in self.graph.edges:
+            in_edges_of.setdefault(e.to_node, []).append(e)
+        ops = self.container.get("ops", {})
+        index_of: Dict[str, int] = {}
+        level_of: List[int] = []
+        for i, node in enumerate(nodes):
+            op = ops.get(node.type_name)
+            if not callable(op):
+                raise RuntimeError(f"Unknown op: {node.type_name}")
+            in_edges = in_edges_of.get(node.id, [])
+            inputs = [
+                (index_of[e.from_node], sys.intern(e.to_port), _port_reader(sys.intern(e.from_port)))
+                for e in in_edges
+            ]
+            nid = sys.intern(node.id)
+            index_of[nid] = i
+            self._plan.append((nid, node, op, inputs, len(inputs) == 1))
+            self._ids.append(nid)
+            level = max((level_of[src] + 1 for src, _, _ in inputs), default=0)
+            level_of.append(level)
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(i)
 
     def run(self, payload: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        outputs: Dict[str, Dict[str, Any]] = {}
-        try:
-            # topologically sort nodes (raises CycleError if cyclic)
-            nodes = self.graph.topo_sort()
-        except CycleError as e:
-            raise RuntimeError(f"Cannot run: graph has cycles: {e}") from e
-
-        for node in nodes:
+        if self.parallel:
+            results = self._run_levels(payload)
+        else:
+            step = self._step
+            results = []
+            for item in self._plan:
+                results.append(step(item, results, payload))
+        return dict(zip(self._ids, results))
+
+    def _run_levels(self, payload: Dict[str, Any]) -> Results:
+        plan = self._plan
+        step = self._step
+        results: Results = [_EMPTY] * len(plan)
+        for level in self._levels:
+            if len(level) == 1:
+                i = level[0]
+                results[i] = step(plan[i], results, payload)
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="voide")
+                # a Runner dropped without close() still releases its threads
+                weakref.finalize(self, self._executor.shutdown, wait=False)
+            # a level only reads results of earlier levels, so results is not
+            # written until every node of this level has finished
+            futures = [self._executor.submit(step, plan[i], results, payload) for i in level]
+            for i, fut in zip(level, futures):
+                results[i] = fut.result()
+        return results
+
+    def _step(self, item: PlanItem, results: Results, payload: Dict[str, Any]) -> Dict[str, Any]:
+        _, node, op, inputs, passthrough = item
+        if passthrough:
+            src, to_port, read = inputs[0]
+            prev = results[src]
+            msg: Dict[str, Any] = dict(prev)
+            value = read(prev)
+            if value is not _MISSING:
+                msg[to_port] = value
+        elif inputs:
             # collect inputs for this node
-            msg: Dict[str, Any] = {}
-            for e in self._in_edges.get(node.id, []):
-                prev = outputs.get(e.from_node, {})
-                if e.from_port in prev:
-                    msg[e.to_port] = prev[e.from_port]
-            # if no incoming edges, seed with the original payload
-            if not self._in_edges.get(node.id):
-                msg = dict(payload)
-
-            # find the op to execute
-            op = self.container.get("ops", {}).get(node.type_name)
-            if not callable(op):
-                raise RuntimeError(f"Unknown op: {node.type_name}")
+            msg = {}
+            for src, to_port, read in inputs:
+                value = read(results[src])
+                if value is not _MISSING:
+                    msg[to_port] = value
+        else:
+            # no incoming edges: seed with the original payload
+            msg = dict(payload) if self.copy_payload else payload
+
+        res = op(msg, node.config, self.container)
+        if not isinstance(res, dict):
+            raise RuntimeError(f"Op must return dict, got {type(res)}")
+        return res
 
-            res = op(msg, node.config, self.container)
-            if not isinstance(res, dict):
-                raise RuntimeError(f"Op must return dict, got {type(res)}")
+    def close(self) -> None:
+        """Shut down the thread pool used by parallel runs, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
-            outputs[node.id] = res
+    def __enter__(self) -> Runner:
+        return self
 
-        return outputs
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
-def compile(graph: Graph, container: Dict[str, Any]) -> Runner:
+def compile(
+    graph: Graph,
+    container: Dict[str, Any],
+    copy_payload: bool = False,
+    parallel: bool = False,
+    max_workers: int | None = None,
+) -> Runner:
     """
     Factory to create a Runner for the given graph and container.
     """
-    return Runner(graph, container)
+    return Runner(graph, container, copy_payload=copy_payload, parallel=parallel, max_workers=max_workers)
 
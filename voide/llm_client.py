@@ -1,46 +1,252 @@
 # File: workspace/voide/llm_client.py
+"""LLM client facade for VOIDE.
+
+Backends:
+- echo: returns the prompt prefixed with "ECHO: " (no dependencies)
+- llama_cpp: local GGUF model via llama-cpp-python
+- openai: OpenAI chat completions
+
+Optional backends import their packages lazily, so a missing package only
+matters when that backend is selected.
+
+Every adapter also has acomplete/achat coroutines, so callers can overlap
+several requests with asyncio.gather.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List
+
+
+# Echo has no tokenizer; max_tokens is applied as roughly this many characters each.
+ECHO_CHARS_PER_TOKEN = 4
+
+
+class EchoAdapter:
+    """Dependency-free backend; also the fallback for unavailable backends.
+
+    Like a real backend it honours max_tokens, so echoing a huge prompt yields
+    a bounded response instead of a full-size copy.
+    """
+
+    def complete(self, prompt: str, max_tokens: int | None = None) -> str:
+        if max_tokens is not None:
+            prompt = prompt[: max_tokens * ECHO_CHARS_PER_TOKEN]
+        return "ECHO: " + prompt
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        last = messages[-1].get("content", "") if messages else ""
+        return self.complete(str(last), max_tokens)
+
+    async def acomplete(self, prompt: str, max_tokens: int | None = None) -> str:
+        return self.complete(prompt, max_tokens)
+
+    async def achat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        return self.chat(messages, max_tokens)
+
+
+class LlamaCppAdapter:
+    """Local model served from a pool of up to n_ctx_slots Llama instances.
+
+    One instance evaluates one prompt at a time, so each call borrows an idle
+    instance and resets it afterwards. llama-cpp-python's Llama owns both the
+    model and its context, so every slot beyond the first is a separate model
+    load: CPU weights are shared only through the OS page cache (mmap), and
+    with GPU offload each slot holds its own copy in VRAM. The default of one
+    slot serialises calls; raise it only when memory allows. Extra instances
+    are created on demand, when calls overlap.
+    """
+
+    def __init__(self, model_path: str, n_ctx_slots: int = 1) -> None:
+        if not Path(model_path).exists():
+            raise FileNotFoundError(model_path)
+        from llama_cpp import Llama  # optional dependency
+
+        self._new_context = partial(Llama, model_path=model_path)
+        # loaded eagerly so a bad model fails here, where LLMClient can fall back
+        self._idle: List[Any] = [self._new_context()]
+        self._slots = threading.BoundedSemaphore(max(1, n_ctx_slots))
+
+    @contextmanager
+    def _context(self) -> Iterator[Any]:
+        with self._slots:
+            try:
+                llama = self._idle.pop()
+            except IndexError:
+                llama = self._new_context()
+            try:
+                yield llama
+            finally:
+                llama.reset()
+                self._idle.append(llama)
+
+    def complete(self, prompt: str, max_tokens: int | None = None) -> str:
+        with self._context() as llama:
+            out = llama(prompt, max_tokens=max_tokens)
+        return out["choices"][0]["text"]
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        with self._context() as llama:
+            out = llama.create_chat_completion(messages=messages, max_tokens=max_tokens)
+        return out["choices"][0]["message"]["content"] or ""
+
+    async def acomplete(self, prompt: str, max_tokens: int | None = None) -> str:
+        return await asyncio.to_thread(self.complete, prompt, max_tokens)
+
+    async def achat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        return await asyncio.to_thread(self.chat, messages, max_tokens)
+
+
+_BATCH_HEADER = (
+    "Answer each request independently. Wrap the answer to request <<n>>...<</n>>"
+    " in the same markers, <<n>>answer<</n>>, in order, with nothing between them.\n"
 )
-return resp.choices[0].message.content or ""
+_ITEM = re.compile(r"<<(\d+)>>(.*?)<</\1>>", re.DOTALL)
+_OPEN = re.compile(r"<<\d+>>")
+
+
+def _split_marked(text: str, count: int) -> List[str] | None:
+    """Answers 1..count from <<n>>...<</n>> markers, or None unless each appears once, in order."""
+    items = _ITEM.findall(text)
+    if [int(n) for n, _ in items] != list(range(1, count + 1)):
+        return None
+    if len(_OPEN.findall(text)) != count:  # an unclosed or stray marker
+        return None
+    return [answer.strip() for _, answer in items]
+
+
+# Keep-alive pool shared by every OpenAIAdapter in the process, so per-node
+# clients reuse warm TLS connections instead of each dialing their own.
+_http_client: Any = None
+_http_client_lock = threading.Lock()
+
+
+def _shared_http_client() -> Any:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            import httpx  # installed with openai
+
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60.0),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            )
+        return _http_client
+
+
+class OpenAIAdapter:
+    def __init__(self, model: str = "gpt-4o-mini") -> None:
+        from openai import OpenAI  # optional dependency
+
+        self.model = model
+        self._client = OpenAI(http_client=_shared_http_client())
+        # resolved once; every request goes through the same bound method
+        self._create = self._client.chat.completions.create
+        self._acreate: Any = None  # AsyncOpenAI's create, built on first async call
+
+    def complete(self, prompt: str, max_tokens: int | None = None) -> str:
+        return self.chat([{"role": "user", "content": prompt}], max_tokens)
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        resp = self._create(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+        )
+        return resp.choices[0].message.content or ""
+
+    async def acomplete(self, prompt: str, max_tokens: int | None = None) -> str:
+        return await self.achat([{"role": "user", "content": prompt}], max_tokens)
+
+    async def achat(self, messages: List[Dict[str, str]], max_tokens: int | None = None) -> str:
+        if self._acreate is None:
+            from openai import AsyncOpenAI
+
+            self._acreate = AsyncOpenAI().chat.completions.create
+        resp = await self._acreate(
+            model=self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+        )
+        return resp.choices[0].message.content or ""
 
 
 @dataclass
 class LLMConfig:
-backend: str = "echo"
-model_path: str | None = None
-model: str | None = None
-max_input_tokens: int | None = 4096
-max_response_tokens: int | None = 512
-forward_input_with_response: bool = False
+    backend: str = "echo"
+    model_path: str | None = None
+    model: str | None = None
+    max_input_tokens: int | None = 4096
+    max_response_tokens: int | None = 512
+    forward_input_with_response: bool = False
+    marshal_batch_size: int = 8
+    n_ctx_slots: int = 1  # each slot is a full model load, see LlamaCppAdapter
 
 
 class LLMClient:
-"""Facade selecting a backend with graceful fallback to echo."""
-
-
-def __init__(self, config: Dict[str, Any] | None = None, *, fallback_to_echo: bool = True) -> None:
-cfg = LLMConfig(**(config or {}))
-self.config = cfg
-self.backend = cfg.backend
-try:
-if cfg.backend == "llama_cpp":
-if not cfg.model_path:
-raise FileNotFoundError("model_path required for llama_cpp")
-self._adapter = LlamaCppAdapter(cfg.model_path)
-elif cfg.backend == "openai":
-self._adapter = OpenAIAdapter(model=(cfg.model or "gpt-4o-mini"))
-else:
-self._adapter = EchoAdapter()
-self.backend = "echo"
-except Exception:
-if not fallback_to_echo:
-raise
-self._adapter = EchoAdapter()
-self.backend = "echo"
-
-
-def complete(self, prompt: str) -> str:
-return self._adapter.complete(prompt, self.config.max_response_tokens)
-
-
-def chat(self, messages: List[Dict[str, str]]) -> str:
-return self._adapter.chat(messages, self.config.max_response_tokens)
+    """Facade selecting a backend with graceful fallback to echo.
+
+    complete(prompt), chat(messages) and their async forms acomplete/achat
+    call the selected adapter with config.max_response_tokens.
+    """
+
+    def __init__(self, config: Dict[str, Any] | None = None, *, fallback_to_echo: bool = True) -> None:
+        cfg = LLMConfig(**(config or {}))
+        self.config = cfg
+        self.backend = cfg.backend
+        try:
+            if cfg.backend == "llama_cpp":
+                if not cfg.model_path:
+                    raise FileNotFoundError("model_path required for llama_cpp")
+                self._adapter = LlamaCppAdapter(cfg.model_path, n_ctx_slots=cfg.n_ctx_slots)
+            elif cfg.backend == "openai":
+                self._adapter = OpenAIAdapter(model=(cfg.model or "gpt-4o-mini"))
+            else:
+                self._adapter = EchoAdapter()
+                self.backend = "echo"
+        except Exception:
+            if not fallback_to_echo:
+                raise
+            self._adapter = EchoAdapter()
+            self.backend = "echo"
+        # Call straight into the adapter with max_tokens bound, so there is no
+        # facade frame per call; max_response_tokens is read once, here.
+        max_tokens = cfg.max_response_tokens
+        self.complete: Callable[[str], str] = partial(self._adapter.complete, max_tokens=max_tokens)
+        self.chat: Callable[[List[Dict[str, str]]], str] = partial(self._adapter.chat, max_tokens=max_tokens)
+        self.acomplete: Callable[[str], Awaitable[str]] = partial(self._adapter.acomplete, max_tokens=max_tokens)
+        self.achat: Callable[[List[Dict[str, str]]], Awaitable[str]] = partial(
+            self._adapter.achat, max_tokens=max_tokens
+        )
+
+    def batch_complete(self, prompts: List[str], marshal: int | None = None) -> List[str]:
+        """Complete independent prompts, packing up to marshal per request.
+
+        Each prompt in a group is wrapped in <<n>>...<</n>> markers and the
+        answers are split back out by the same markers, trading larger
+        requests for fewer round-trips. A group whose response has any marker
+        missing, repeated or out of order is retried one prompt per request.
+        The echo backend always answers per prompt. marshal defaults to
+        config.marshal_batch_size.
+        """
+        if self.backend == "echo":
+            return [self.complete(p) for p in prompts]
+        size = max(1, marshal or self.config.marshal_batch_size)
+        per_prompt = self.config.max_response_tokens
+        out: List[str] = []
+        for start in range(0, len(prompts), size):
+            group = prompts[start:start + size]
+            if len(group) == 1:
+                out.append(self.complete(group[0]))
+                continue
+            packed = _BATCH_HEADER + "\n".join(f"<<{n}>>{p}<</{n}>>" for n, p in enumerate(group, 1))
+            text = self._adapter.complete(packed, None if per_prompt is None else per_prompt * len(group))
+            answers = _split_marked(text, len(group))
+            out.extend(answers if answers is not None else [self.complete(p) for p in group])
+        return out
@@ -1,64 +1,380 @@
 # File: workspace/voide/storage.py
-self._ensure_table()
+"""Persistence helpers: a SQLite-backed MemoryStore and an append-only JSONLog."""
+from __future__ import annotations
 
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
 
-def _ensure_table(self) -> None:
-cur = self._conn.cursor()
-cur.execute(
-'''
+try:  # optional: C encoder that emits bytes directly
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # orjson rejects some values json accepts (ints wider than 64 bits), so
+    # each call falls back to json rather than changing what can be stored.
+    def _dump_line(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            return (json.dumps(obj) + "\n").encode("utf-8")
+
+    def _dumps(obj: Any) -> str:
+        # stored as TEXT, so LIKE and the FTS index see a string
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+
+    def _loads(text: str) -> Any:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
+else:
+    def _dump_line(obj: Any) -> bytes:
+        return (json.dumps(obj) + "\n").encode("utf-8")
+
+    _dumps = json.dumps
+    _loads = json.loads
+
+
+_STATEMENT_CACHE = 1024
+_ROW_CACHE_SIZE = 1024
+
+# The store is a local cache, not a system of record: WAL with NORMAL sync
+# skips the fsync per commit and lets readers proceed during writes. Applied
+# to every connection; journal_mode is persistent in the file itself.
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-20000;
+"""
+
+# Statement text lives in module constants so every call hands sqlite3 the same
+# string and hits its per-connection prepared-statement cache.
+_CREATE_SQL = """
 CREATE TABLE IF NOT EXISTS items (
-key TEXT PRIMARY KEY,
-value TEXT,
-created_at REAL
-)
-'''
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    created_at REAL,
+    expires_at REAL
 )
-self._conn.commit()
+"""
+_UPSERT_SQL = """
+INSERT INTO items(key, value, created_at, expires_at) VALUES (?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET value=excluded.value, created_at=excluded.created_at,
+    expires_at=excluded.expires_at
+"""
+_GET_SQL = "SELECT value, created_at, expires_at FROM items WHERE key=?"
+_QUERY_SQL = """
+SELECT value FROM items
+WHERE value LIKE ? AND (expires_at IS NULL OR expires_at > ?)
+ORDER BY created_at DESC LIMIT ?
+"""
+# Full-text index over item values, kept in sync with items by triggers.
+_FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    key UNINDEXED, value, content='items', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, key, value) VALUES (new.rowid, new.key, new.value);
+END;
+CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, key, value) VALUES ('delete', old.rowid, old.key, old.value);
+END;
+CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, key, value) VALUES ('delete', old.rowid, old.key, old.value);
+    INSERT INTO items_fts(rowid, key, value) VALUES (new.rowid, new.key, new.value);
+END;
+"""
+_FTS_QUERY_SQL = """
+SELECT items.value FROM items_fts JOIN items ON items.rowid = items_fts.rowid
+WHERE items_fts MATCH ? AND (items.expires_at IS NULL OR items.expires_at > ?)
+ORDER BY bm25(items_fts) LIMIT ?
+"""
+_PURGE_SQL = "DELETE FROM items WHERE expires_at <= ?"
 
 
-def upsert(self, key: str, value: Dict[str, Any]) -> None:
-t = time.time()
-cur = self._conn.cursor()
-cur.execute(
-'''
-INSERT INTO items(key, value, created_at) VALUES (?, ?, ?)
-ON CONFLICT(key) DO UPDATE SET value=excluded.value, created_at=excluded.created_at
-''', (key, json.dumps(value), t)
-)
-self._conn.commit()
+# (JSON text, created_at, expires_at) of a row as last read
+Row = Tuple[str, float, "float | None"]
+
+
+class _RowCache:
+    """LRU of rows by key, shared by the stores open on one database file."""
+
+    __slots__ = ("_rows", "_lock", "generation", "__weakref__")
+
+    def __init__(self) -> None:
+        self._rows: "OrderedDict[str, Row]" = OrderedDict()
+        self._lock = threading.Lock()
+        # bumped by every discard; a row read before a write is not cached after it
+        self.generation = 0
+
+    def get(self, key: str) -> Row | None:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self._rows.move_to_end(key)
+            return row
+
+    def put(self, key: str, row: Row, generation: int) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+            if len(self._rows) > _ROW_CACHE_SIZE:
+                self._rows.popitem(last=False)
+
+    def discard(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                self._rows.pop(key, None)
+
+
+# Row caches by database file identity (st_dev, st_ino), held weakly by the
+# stores open on that file. A write through one store then invalidates the
+# others' reads, while a deleted and recreated file starts with a fresh cache.
+_row_caches: "weakref.WeakValueDictionary[Tuple[int, int], _RowCache]" = weakref.WeakValueDictionary()
+_row_caches_lock = threading.Lock()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    # check_same_thread=False: a store may be used from Runner pool threads;
+    # MemoryStore serialises access to its connection with its own lock.
+    if path == ":memory:":
+        # each in-memory store is its own database
+        conn = sqlite3.connect(path, check_same_thread=False, cached_statements=_STATEMENT_CACHE)
+        conn.execute("PRAGMA cache_size=-20000")
+        return conn
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, cached_statements=_STATEMENT_CACHE)
+    conn.executescript(_PRAGMAS)
+    return conn
+
+
+def _row_cache_for(path: str) -> _RowCache:
+    if path == ":memory:":
+        return _RowCache()
+    st = os.stat(path)
+    ident = (st.st_dev, st.st_ino)
+    with _row_caches_lock:
+        cache = _row_caches.get(ident)
+        if cache is None:
+            cache = _row_caches[ident] = _RowCache()
+    return cache
 
 
-def get(self, key: str, ttl: float | None = None) -> Dict[str, Any] | None:
-cur = self._conn.cursor()
-row = cur.execute(
-'SELECT value, created_at FROM items WHERE key=?', (key,)
-).fetchone()
-if not row:
-return None
-val, ts = row
-if ttl is not None and time.time() - ts > ttl:
-return None
-return json.loads(val)
+class MemoryStore:
+    """Key/value store of JSON documents backed by SQLite.
 
+    Each store has its own connection; calls on one store are serialised, so
+    it may be shared between threads. Recently read rows are kept in an
+    in-process LRU shared by the stores open on the same file, so repeated
+    get() calls skip the SQLite round-trip; the JSON text is cached and
+    decoded on every hit, so each call returns a fresh value. Writes through
+    any MemoryStore in this process keep it current; rows changed by another
+    process may be seen late.
+    """
 
-def query(self, pattern: str, k: int = 8) -> List[Dict[str, Any]]:
-cur = self._conn.cursor()
-rows = cur.execute(
-'''SELECT value FROM items WHERE value LIKE ? ORDER BY created_at DESC LIMIT ?''',
-(f"%{pattern}%", k)
-).fetchall()
-return [json.loads(r[0]) for r in rows]
+    def __init__(self, path: str = "artifacts/memory.db") -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._ensure_table()
+        self._rows = _row_cache_for(path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+            # once the file is no longer held open its inode may be reused, so
+            # stop keeping its row cache alive
+            self._rows = _RowCache()
+
+    def _ensure_table(self) -> None:
+        cur = self._conn.cursor()
+        cur.execute(_CREATE_SQL)
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(items)")}
+        if "expires_at" not in columns:  # databases created before expires_at
+            cur.execute("ALTER TABLE items ADD COLUMN expires_at REAL")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_items_expires ON items(expires_at)")
+        # lets the LIKE fallback walk rows newest first and stop after k matches
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_items_created ON items(created_at DESC)")
+        self._fts = self._ensure_fts(cur)
+        self._conn.commit()
+        self.purge_expired()
+
+    def _ensure_fts(self, cur: sqlite3.Cursor) -> bool:
+        """Create the FTS5 index if this SQLite has it; False means LIKE-only queries."""
+        exists = cur.execute("SELECT 1 FROM sqlite_master WHERE name='items_fts'").fetchone()
+        if not exists:
+            try:
+                cur.executescript(_FTS_SQL)
+            except sqlite3.OperationalError:  # built without FTS5
+                return False
+            # index rows written before the table existed
+            cur.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+        return True
+
+    def upsert(self, key: str, value: Dict[str, Any], ttl: float | None = None) -> None:
+        """Insert or replace key; with ttl, the row expires ttl seconds from now."""
+        t = time.time()
+        text = _dumps(value)
+        with self._lock:
+            self._conn.execute(_UPSERT_SQL, (key, text, t, None if ttl is None else t + ttl))
+            self._conn.commit()
+        self._rows.discard((key,))
+
+    def upsert_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], ttl: float | None = None) -> int:
+        """Upsert (key, value) pairs in one transaction; returns the number written."""
+        t = time.time()
+        expires_at = None if ttl is None else t + ttl
+        rows = [(key, _dumps(value), t, expires_at) for key, value in items]
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_SQL, rows)
+        self._rows.discard(r[0] for r in rows)
+        return len(rows)
+
+    def get(self, key: str, ttl: float | None = None) -> Dict[str, Any] | None:
+        """Return the value for key, or None if missing or expired.
+
+        A row expires at its stored expires_at, and additionally when ttl is
+        given and it was written more than ttl seconds ago. Both checks are
+        made against the cached row when the key is in the LRU.
+        """
+        row = self._rows.get(key)
+        if row is None:
+            generation = self._rows.generation
+            with self._lock:
+                fetched = self._conn.execute(_GET_SQL, (key,)).fetchone()
+            if not fetched:
+                return None
+            row = (fetched[0], fetched[1], fetched[2])
+            self._rows.put(key, row, generation)
+        text, created_at, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            return None
+        if ttl is not None and created_at < now - ttl:
+            return None
+        return _loads(text)
+
+    def query(self, pattern: str, k: int = 8) -> List[Dict[str, Any]]:
+        """Return up to k live values matching pattern, best match first.
+
+        With FTS5, pattern is matched as a phrase whose last word may be a
+        prefix, ranked by bm25. A pattern without any word characters, or one
+        FTS5 cannot parse, falls back to a substring scan ordered newest first.
+        """
+        now = time.time()
+        with self._lock:
+            if self._fts and any(ch.isalnum() for ch in pattern):
+                phrase = '"' + pattern.replace('"', '""') + '"*'
+                try:
+                    # a malformed MATCH fails on execute, before any row is read
+                    cur = self._conn.execute(_FTS_QUERY_SQL, (phrase, now, k))
+                except sqlite3.OperationalError:
+                    pass
+                else:
+                    return [_loads(r[0]) for r in cur]
+            return [_loads(r[0]) for r in self._conn.execute(_QUERY_SQL, (f"%{pattern}%", now, k))]
+
+    def purge_expired(self) -> int:
+        """Delete rows past their expires_at; returns the number removed."""
+        with self._lock:
+            cur = self._conn.execute(_PURGE_SQL, (time.time(),))
+            self._conn.commit()
+        return cur.rowcount
+
+
+# Formatting a timestamp costs a gmtime() plus strftime(); log lines written
+# within the same second share one string.
+_ts_second = -1
+_ts_text = ""
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as ISO-8601 with a trailing Z, at second resolution."""
+    global _ts_second, _ts_text
+    now = int(time.time())
+    if now != _ts_second:
+        _ts_text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _ts_second = now
+    return _ts_text
+
+
+# Logs with pending lines are flushed at interpreter exit; the set holds them
+# weakly so an unused log can still be collected (and closed by __del__).
+_open_logs: "weakref.WeakSet[JSONLog]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_logs() -> None:
+    for log in list(_open_logs):
+        log.close()
 
 
 class JSONLog:
-"""Append JSON lines to a file with ISO timestamps."""
-def __init__(self, path: str) -> None:
-self.path = path
-Path(path).parent.mkdir(parents=True, exist_ok=True)
+    """Append JSON lines to a file with ISO timestamps.
+
+    The file is opened once in append mode and kept open. With buffer_size > 0,
+    lines are collected and written in one call once that many bytes are
+    pending, or on flush()/close(); the default writes each line through.
+    Each flush is a single O_APPEND write, so lines from several writers do
+    not interleave. append() may be called from several threads.
+    """
+    def __init__(self, path: str, buffer_size: int = 0) -> None:
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buf = bytearray()
+        self._fd: int | None = None
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        _open_logs.add(self)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = _dump_line({**record, "timestamp": utc_timestamp()})
+        with self._lock:
+            self._buf += line
+            if len(self._buf) > self.buffer_size:
+                self._write()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write()
+
+    def _write(self) -> None:
+        if not self._buf:
+            return
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        with memoryview(self._buf) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(self._fd, view[written:])
+        self._buf.clear()
 
+    def close(self) -> None:
+        with self._lock:
+            self._write()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
 
-def append(self, record: Dict[str, Any]) -> None:
-line = json.dumps({**record, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
-with open(self.path, "a", encoding="utf-8") as f:
-f.write(line + "
-")
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
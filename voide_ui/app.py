@@ -1,11 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import tkinter as tk
-from tkinter import filedialog, messagebox
-from voide import assemble
-from voide.compiler import compile as compile_graph
 from voide_ui.canvas import GraphCanvas
-from voide_ui.chat import ChatWindow
 from voide_ui import options as opt
 from voide_ui.state import save_graph, load_graph
 
@@ -21,6 +19,17 @@ LABEL_TO_TYPE = {
     "UI": "UI",
 }
 
+def _build_signature(g) -> bytes:
+    """Digest of the graph's nodes, configs and edges plus the chunk files it builds against."""
+    from voide.assemble import chunks_signature
+
+    h = hashlib.blake2b(digest_size=16)
+    nodes = [(n.id, n.type_name, n.config) for n in g.nodes.values()]
+    edges = [(e.from_node, e.from_port, e.to_node, e.to_port) for e in g.edges]
+    h.update(json.dumps([nodes, edges], sort_keys=True, default=str).encode("utf-8"))
+    h.update(repr(chunks_signature()).encode("utf-8"))
+    return h.digest()
+
 class App(tk.Tk):
     def __init__(self) -> None:
         super().__init__()
@@ -36,6 +45,7 @@ class App(tk.Tk):
         self._build_body()
 
         self.runner = None
+        self._runner_sig: bytes | None = None  # _build_signature() the runner was compiled from
         self.chat = None  # type: ignore
 
     # ---- UI ----
@@ -79,11 +89,11 @@ class App(tk.Tk):
 
     # ---- actions ----
     def _new(self):
-        self.canvas.delete("all")
-        self.canvas.nodes.clear()
-        self.canvas.edges.clear()
+        self.canvas.clear()
 
     def _open(self):
+        from tkinter import filedialog
+
         p = filedialog.askopenfilename(filetypes=[("VOIDE Graph", "*.json")])
         if not p:
             return
@@ -91,6 +101,8 @@ class App(tk.Tk):
         self.canvas.load_from(g, pos)
 
     def _save_as(self):
+        from tkinter import filedialog
+
         p = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("VOIDE Graph", "*.json")])
         if not p:
             return
@@ -108,13 +120,9 @@ class App(tk.Tk):
         self.canvas.add_node(nid, type_name, 60 + (self._node_seq % 5) * 40, 80 + (self._node_seq % 7) * 30, config={})
 
     def _open_options_for_hit(self, ev):
-        items = self.canvas.find_overlapping(ev.x, ev.y, ev.x, ev.y)
-        for it in items:
-            for tag in self.canvas.gettags(it):
-                if tag.startswith("node:"):
-                    nid = tag.split(":", 1)[1]
-                    self._open_options_for_node(nid)
-                    return
+        nid = self.canvas.node_at(ev.x, ev.y)
+        if nid is not None:
+            self._open_options_for_node(nid)
 
     def _open_options_for_node(self, nid: str):
         nw = self.canvas.nodes[nid]
@@ -141,24 +149,36 @@ class App(tk.Tk):
 
     def _ensure_chat(self):
         if self.chat is None or not self.chat.winfo_exists():
+            from voide_ui.chat import ChatWindow
+
             self.chat = ChatWindow(self, self._on_chat_send)
 
     def _open_chat(self):
         self._ensure_chat()
 
     def _build(self):
-        container = assemble()
-        container.setdefault("ops", {})["UI"] = lambda m, c, ct: dict(m)
+        # The assembler, compiler and dialogs are only needed once the user builds.
+        from tkinter import messagebox
+        from voide import assemble
+        from voide.compiler import compile as compile_graph
+
         g, _ = self.canvas.to_graph()
-        try:
-            runner = compile_graph(g, container)
-        except Exception as e:
-            messagebox.showerror("Build failed", str(e))
-            return
-        self.runner = runner
+        sig = _build_signature(g)
+        if self.runner is None or sig != self._runner_sig:
+            container = assemble()
+            container.setdefault("ops", {})["UI"] = lambda m, c, ct: dict(m)
+            try:
+                runner = compile_graph(g, container)
+            except Exception as e:
+                messagebox.showerror("Build failed", str(e))
+                return
+            self.runner = runner
+            self._runner_sig = sig
         messagebox.showinfo("Build", "Build successful.")
 
     def _on_chat_send(self, text: str):
+        from tkinter import messagebox
+
         if not self.runner:
             self._build()
             if not self.runner:
@@ -170,7 +190,7 @@ class App(tk.Tk):
             messagebox.showerror("Run failed", str(e))
             return
         completion = None
-        for nid in reversed(list(out.keys())):
+        for nid in reversed(out):
             val = out[nid]
             if isinstance(val, dict) and "completion" in val:
                 completion = val["completion"]
@@ -19,7 +19,29 @@ PORTS = {
     "UI": {"inputs": [], "outputs": ["prompt"]},
 }
 
-@dataclass
+# PORTS flattened once to (inputs, outputs) tuples for add_node
+_PORT_SPECS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    name: (tuple(spec.get("inputs", ())), tuple(spec.get("outputs", ())))
+    for name, spec in PORTS.items()
+}
+_DEFAULT_PORTS = (("in",), ("out",))
+
+PORT_RADIUS = 6
+# Ports are indexed in a grid of CELL-pixel squares for hit-testing.
+CELL = 16
+
+
+def _port_cells(cx: float, cy: float) -> List[Tuple[int, int]]:
+    """Grid cells overlapped by a port centered at (cx, cy)."""
+    r = PORT_RADIUS
+    return [
+        (i, j)
+        for i in range(int((cx - r) // CELL), int((cx + r) // CELL) + 1)
+        for j in range(int((cy - r) // CELL), int((cy + r) // CELL) + 1)
+    ]
+
+
+@dataclass(slots=True)
 class NodeWidget:
     id: str
     type_name: str
@@ -30,14 +52,22 @@ class NodeWidget:
     label: int
     in_ports: Dict[str, int]
     out_ports: Dict[str, int]
+    # port name -> canvas center, kept in step with the node so edge endpoints
+    # need no bbox() round-trip
+    in_centers: Dict[str, Tuple[float, float]]
+    out_centers: Dict[str, Tuple[float, float]]
 
 class GraphCanvas(tk.Canvas):
     def __init__(self, master: tk.Misc, **kw):
         super().__init__(master, background="#1e1f22", highlightthickness=0, **kw)
         self.nodes: Dict[str, NodeWidget] = {}
         self.edges: List[tuple[str, str, str, str, int]] = []  # (from_id, from_port, to_id, to_port, line_id)
+        self._edges_by_node: Dict[str, List[int]] = {}  # node_id -> indices into self.edges
+        self._port_index: Dict[Tuple[int, int], List[tuple[str, str, str]]] = {}  # cell -> (node_id, "in"|"out", port)
         self._drag: tuple[str, int, int] | None = None
         self._connecting: tuple[str, str, int] | None = None  # node_id, port_name, tmp_line_id
+        self._pending_motion: tuple[int, int] | None = None  # latest pointer position not yet drawn
+        self._item_node: Dict[int, str] = {}  # node rectangle item id -> node_id
         self.bind("<ButtonPress-1>", self._on_down)
         self.bind("<B1-Motion>", self._on_drag)
         self.bind("<ButtonRelease-1>", self._on_up)
@@ -46,66 +76,98 @@ class GraphCanvas(tk.Canvas):
     def add_node(self, node_id: str, type_name: str, x: int, y: int, config: dict | None = None):
         cfg = config or {}
         w, h = 140, 60
-        rect = self.create_rectangle(x, y, x + w, y + h, fill="#2b2d31", outline="#4e5157", width=2, tags=(f"node:{node_id}",))
-        label = self.create_text(x + w / 2, y + 15, text=type_name, fill="#e6e6e6", font=("TkDefaultFont", 10, "bold"))
+        group = f"ng:{node_id}"  # every item of the node, so a drag is one move() call
+        rect = self.create_rectangle(x, y, x + w, y + h, fill="#2b2d31", outline="#4e5157", width=2, tags=(f"node:{node_id}", group))
+        label = self.create_text(x + w / 2, y + 15, text=type_name, fill="#e6e6e6", font=("TkDefaultFont", 10, "bold"), tags=(group,))
         # ports
-        spec = PORTS.get(type_name, {"inputs": ["in"], "outputs": ["out"]})
+        inputs, outputs = _PORT_SPECS.get(type_name, _DEFAULT_PORTS)
         in_ports: Dict[str, int] = {}
         out_ports: Dict[str, int] = {}
-        for i, name in enumerate(spec.get("inputs", [])):
+        in_centers: Dict[str, Tuple[float, float]] = {}
+        out_centers: Dict[str, Tuple[float, float]] = {}
+        for i, name in enumerate(inputs):
             cy = y + 30 + i * 16
-            pid = self.create_oval(x - 6, cy - 6, x + 6, cy + 6, fill="#3b82f6", outline="", tags=(f"port_in:{node_id}:{name}",))
+            pid = self.create_oval(x - 6, cy - 6, x + 6, cy + 6, fill="#3b82f6", outline="", tags=(f"port_in:{node_id}:{name}", group))
             in_ports[name] = pid
-        for i, name in enumerate(spec.get("outputs", [])):
+            in_centers[name] = (x, cy)
+        for i, name in enumerate(outputs):
             cy = y + 30 + i * 16
-            pid = self.create_oval(x + w - 6, cy - 6, x + w + 6, cy + 6, fill="#22c55e", outline="", tags=(f"port_out:{node_id}:{name}",))
+            pid = self.create_oval(x + w - 6, cy - 6, x + w + 6, cy + 6, fill="#22c55e", outline="", tags=(f"port_out:{node_id}:{name}", group))
             out_ports[name] = pid
-        self.nodes[node_id] = NodeWidget(node_id, type_name, x, y, cfg, rect, label, in_ports, out_ports)
+            out_centers[name] = (x + w, cy)
+        self._item_node[rect] = node_id
+        self.nodes[node_id] = nw = NodeWidget(node_id, type_name, x, y, cfg, rect, label, in_ports, out_ports, in_centers, out_centers)
+        self._index_ports(nw)
+
+    def _index_ports(self, n: NodeWidget, remove: bool = False) -> None:
+        index = self._port_index
+        for kind, centers in (("in", n.in_centers), ("out", n.out_centers)):
+            for name, (cx, cy) in centers.items():
+                entry = (n.id, kind, name)
+                for cell in _port_cells(cx, cy):
+                    if remove:
+                        bucket = index[cell]
+                        bucket.remove(entry)
+                        if not bucket:
+                            del index[cell]
+                    else:
+                        index.setdefault(cell, []).append(entry)
 
     def ports_at(self, x: int, y: int) -> tuple[str, str] | None:
-        items = self.find_overlapping(x, y, x, y)
-        for it in items:
-            for tag in self.gettags(it):
-                if tag.startswith("port_in:"):
-                    _, nid, pname = tag.split(":", 2)
-                    return (nid, f"in:{pname}")
-                if tag.startswith("port_out:"):
-                    _, nid, pname = tag.split(":", 2)
-                    return (nid, f"out:{pname}")
+        for nid, kind, pname in self._port_index.get((x // CELL, y // CELL), ()):
+            n = self.nodes[nid]
+            cx, cy = (n.in_centers if kind == "in" else n.out_centers)[pname]
+            if abs(cx - x) <= PORT_RADIUS and abs(cy - y) <= PORT_RADIUS:
+                return (nid, f"{kind}:{pname}")
+        return None
+
+    def node_at(self, x: int, y: int) -> str | None:
+        item_node = self._item_node
+        for it in self.find_overlapping(x, y, x, y):
+            nid = item_node.get(it)
+            if nid is not None:
+                return nid
         return None
 
     # ---- events ----
     def _on_down(self, ev):
-        hit = self.find_overlapping(ev.x, ev.y, ev.x, ev.y)
         # start connect if on a port
         pp = self.ports_at(ev.x, ev.y)
         if pp:
             nid, spec = pp
             kind, pname = spec.split(":", 1)
             if kind == "out":
-                x0, y0, x1, y1 = self.bbox(self.nodes[nid].out_ports[pname])
-                line = self.create_line((x0 + x1) / 2, (y0 + y1) / 2, ev.x, ev.y, fill="#94a3b8", width=2, arrow=tk.LAST)
+                sx, sy = self.nodes[nid].out_centers[pname]
+                line = self.create_line(sx, sy, ev.x, ev.y, fill="#94a3b8", width=2, arrow=tk.LAST)
                 self._connecting = (nid, pname, line)
                 return
         # else maybe drag node
-        for it in hit:
-            for tag in self.gettags(it):
-                if tag.startswith("node:"):
-                    nid = tag.split(":", 1)[1]
-                    nx, ny = self.nodes[nid].x, self.nodes[nid].y
-                    self._drag = (nid, ev.x - nx, ev.y - ny)
-                    return
+        nid = self.node_at(ev.x, ev.y)
+        if nid is not None:
+            nw = self.nodes[nid]
+            self._drag = (nid, ev.x - nw.x, ev.y - nw.y)
 
     def _on_drag(self, ev):
+        # Tk can deliver many motion events per frame; only the last position is
+        # drawn, once the event queue is idle.
+        if self._pending_motion is None:
+            self.after_idle(self._flush_motion)
+        self._pending_motion = (ev.x, ev.y)
+
+    def _flush_motion(self) -> None:
+        pos, self._pending_motion = self._pending_motion, None
+        if pos is None:
+            return
+        x, y = pos
         if self._drag:
             nid, ox, oy = self._drag
-            self.move_node(nid, ev.x - ox, ev.y - oy)
+            self.move_node(nid, x - ox, y - oy)
         elif self._connecting:
-            _, _, line = self._connecting
-            x0, y0, *_ = self.coords(line)
-            self.coords(line, x0, y0, ev.x, ev.y)
+            nid, pname, line = self._connecting
+            self.coords(line, *self.nodes[nid].out_centers[pname], x, y)
 
     def _on_up(self, ev):
+        self._flush_motion()
         if self._drag:
             self._drag = None
             return
@@ -122,60 +184,59 @@ class GraphCanvas(tk.Canvas):
                 self.delete(line)
                 return
             # snap line to dst port center
-            x0, y0, x1, y1 = self.bbox(self.nodes[src_nid].out_ports[src_port])
-            sx, sy = (x0 + x1) / 2, (y0 + y1) / 2
-            x0, y0, x1, y1 = self.bbox(self.nodes[dst_nid].in_ports[dst_port])
-            dx, dy = (x0 + x1) / 2, (y0 + y1) / 2
-            self.coords(line, sx, sy, dx, dy)
-            self.edges.append((src_nid, src_port, dst_nid, dst_port, line))
+            self.coords(line, *self.nodes[src_nid].out_centers[src_port], *self.nodes[dst_nid].in_centers[dst_port])
+            self._add_edge(src_nid, src_port, dst_nid, dst_port, line)
+
+    def _add_edge(self, a: str, ap: str, b: str, bp: str, line: int) -> None:
+        i = len(self.edges)
+        self.edges.append((a, ap, b, bp, line))
+        self._edges_by_node.setdefault(a, []).append(i)
+        if b != a:
+            self._edges_by_node.setdefault(b, []).append(i)
 
     def move_node(self, node_id: str, x: int, y: int) -> None:
         n = self.nodes[node_id]
         dx, dy = x - n.x, y - n.y
-        self.move(n.rect, dx, dy)
-        self.move(n.label, dx, dy)
-        for pid in list(n.in_ports.values()) + list(n.out_ports.values()):
-            self.move(pid, dx, dy)
+        self.move(f"ng:{node_id}", dx, dy)
         n.x, n.y = x, y
+        self._index_ports(n, remove=True)
+        for centers in (n.in_centers, n.out_centers):
+            for name, (cx, cy) in centers.items():
+                centers[name] = (cx + dx, cy + dy)
+        self._index_ports(n)
         # update edges connected to this node
-        for (a, ap, b, bp, line) in list(self.edges):
-            if a == node_id:
-                x0, y0, x1, y1 = self.bbox(n.out_ports[ap])
-                sx, sy = (x0 + x1) / 2, (y0 + y1) / 2
-                x0, y0, x1, y1 = self.bbox(self.nodes[b].in_ports[bp])
-                dx2, dy2 = (x0 + x1) / 2, (y0 + y1) / 2
-                self.coords(line, sx, sy, dx2, dy2)
-            if b == node_id:
-                x0, y0, x1, y1 = self.bbox(self.nodes[a].out_ports[ap])
-                sx, sy = (x0 + x1) / 2, (y0 + y1) / 2
-                x0, y0, x1, y1 = self.bbox(n.in_ports[bp])
-                dx2, dy2 = (x0 + x1) / 2, (y0 + y1) / 2
-                self.coords(line, sx, sy, dx2, dy2)
+        nodes, edges = self.nodes, self.edges
+        for i in self._edges_by_node.get(node_id, ()):
+            a, ap, b, bp, line = edges[i]
+            self.coords(line, *nodes[a].out_centers[ap], *nodes[b].in_centers[bp])
 
     # ---- graph conversion ----
     def to_graph(self) -> tuple[Graph, Dict[str, tuple[int, int]]]:
+        # The canvas only holds unique node ids and edges between its own nodes,
+        # so the graph is filled directly rather than through add_node/add_edge.
         g = Graph()
-        for nid, nw in self.nodes.items():
-            g.add_node(Node(id=nid, type_name=nw.type_name, config=nw.config))
-        for a, ap, b, bp, _line in self.edges:
-            g.add_edge(Edge(a, ap, b, bp))
+        g.nodes = {nid: Node(id=nid, type_name=nw.type_name, config=nw.config) for nid, nw in self.nodes.items()}
+        g.edges = [Edge(a, ap, b, bp) for a, ap, b, bp, _line in self.edges]
         pos = {nid: (nw.x, nw.y) for nid, nw in self.nodes.items()}
         return g, pos
 
-    def load_from(self, g: Graph, positions: Dict[str, tuple[int, int]]):
-        # clear
+    def clear(self) -> None:
         self.delete("all")
         self.nodes.clear()
         self.edges.clear()
+        self._edges_by_node.clear()
+        self._port_index.clear()
+        self._item_node.clear()
+
+    def load_from(self, g: Graph, positions: Dict[str, tuple[int, int]]):
+        self.clear()
         for nid, node in g.nodes.items():
             x, y = positions.get(nid, (50, 50))
             self.add_node(nid, node.type_name, x, y, node.config)
         for e in g.edges:
             a = self.nodes[e.from_node]
             b = self.nodes[e.to_node]
-            x0, y0, x1, y1 = self.bbox(a.out_ports.get(e.from_port, list(a.out_ports.values())[0]))
-            sx, sy = (x0 + x1) / 2, (y0 + y1) / 2
-            x0, y0, x1, y1 = self.bbox(b.in_ports.get(e.to_port, list(b.in_ports.values())[0]))
-            dx, dy = (x0 + x1) / 2, (y0 + y1) / 2
+            sx, sy = a.out_centers.get(e.from_port) or next(iter(a.out_centers.values()))
+            dx, dy = b.in_centers.get(e.to_port) or next(iter(b.in_centers.values()))
             line = self.create_line(sx, sy, dx, dy, fill="#94a3b8", width=2, arrow=tk.LAST)
-            self.edges.append((e.from_node, e.from_port, e.to_node, e.to_port, line))
+            self._add_edge(e.from_node, e.from_port, e.to_node, e.to_port, line)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class Field:
+    label: str
+    key: str
+    kind: type = str  # str | int | bool
+    default: Any = ""
+    minvalue: int | None = None
+
+
+class OptionsForm(tk.Toplevel):
+    """Modal form that edits all of a node's option fields in one window.
+
+    After the window closes, result holds the entered values by key, or None
+    if the form was cancelled.
+    """
+    def __init__(self, master: tk.Misc, title: str, fields: Sequence[Field], current: Dict[str, Any]):
+        super().__init__(master)
+        self.title(title)
+        self.transient(master)
+        self.resizable(False, False)
+        self.result: Dict[str, Any] | None = None
+        self._fields = fields
+        self._vars: list[tk.Variable] = []
+
+        for row, f in enumerate(fields):
+            value = current.get(f.key, f.default)
+            tk.Label(self, text=f.label).grid(row=row, column=0, sticky="w", padx=6, pady=3)
+            if f.kind is bool:
+                var: tk.Variable = tk.BooleanVar(self, value=bool(value))
+                tk.Checkbutton(self, variable=var).grid(row=row, column=1, sticky="w", padx=6, pady=3)
+            else:
+                var = tk.StringVar(self, value=str(value))
+                entry = tk.Entry(self, textvariable=var, width=36)
+                entry.grid(row=row, column=1, sticky="ew", padx=6, pady=3)
+                if row == 0:
+                    entry.focus_set()
+            self._vars.append(var)
+
+        self._error = tk.Label(self, fg="#dc2626")
+        self._error.grid(row=len(fields), column=0, columnspan=2, sticky="w", padx=6)
+        frm = tk.Frame(self)
+        frm.grid(row=len(fields) + 1, column=0, columnspan=2, sticky="e", padx=6, pady=6)
+        tk.Button(frm, text="OK", width=8, command=self._ok).pack(side=tk.LEFT, padx=4)
+        tk.Button(frm, text="Cancel", width=8, command=self._cancel).pack(side=tk.LEFT)
+
+        self.bind("<Return>", self._ok)
+        self.bind("<Escape>", self._cancel)
+        self.protocol("WM_DELETE_WINDOW", self._cancel)
+        # X11 refuses a grab on an unmapped window ("window not viewable")
+        self.wait_visibility()
+        self.grab_set()
+        self.wait_window(self)
+
+    def _ok(self, *_):
+        values: Dict[str, Any] = {}
+        for f, var in zip(self._fields, self._vars):
+            raw = var.get()
+            if f.kind is int:
+                try:
+                    raw = int(str(raw).strip())
+                except ValueError:
+                    self._error.config(text=f"{f.label.rstrip(':')} must be an integer")
+                    return
+                if f.minvalue is not None and raw < f.minvalue:
+                    self._error.config(text=f"{f.label.rstrip(':')} must be at least {f.minvalue}")
+                    return
+            values[f.key] = raw
+        self.result = values
+        self.destroy()
+
+    def _cancel(self, *_):
+        self.destroy()
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 from voide.graph import Graph, Node, Edge
 
+try:  # optional: C encoder/decoder that works on bytes directly
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+DEFAULT_POS: Tuple[int, int] = (50, 50)  # position for nodes missing from positions
+
+
+@dataclass(slots=True)
 class NodeState:
     id: str
     type_name: str
@@ -17,7 +25,7 @@ class NodeState:
     config: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class EdgeState:
     from_node: str
     from_port: str
@@ -25,17 +33,16 @@ class EdgeState:
     to_port: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphState:
     nodes: List[NodeState]
     edges: List[EdgeState]
 
 
 def graph_to_state(g: Graph, positions: Dict[str, Tuple[int, int]]) -> GraphState:
-    nodes: List[NodeState] = []
-    for nid, n in g.nodes.items():
-        x, y = positions.get(nid, (50, 50))
-        nodes.append(NodeState(id=n.id, type_name=n.type_name, x=x, y=y, config=n.config))
+    nodes: List[NodeState] = [
+        NodeState(n.id, n.type_name, *positions.get(nid, DEFAULT_POS), n.config) for nid, n in g.nodes.items()
+    ]
     edges: List[EdgeState] = [EdgeState(e.from_node, e.from_port, e.to_node, e.to_port) for e in g.edges]
     return GraphState(nodes=nodes, edges=edges)
 
@@ -52,18 +59,44 @@ def state_to_graph(state: GraphState) -> tuple[Graph, Dict[str, Tuple[int, int]]
 
 
 def save_graph(path: str, g: Graph, positions: Dict[str, Tuple[int, int]]) -> None:
-    state = graph_to_state(g, positions)
+    # Same layout as asdict() over graph_to_state(), without the intermediate
+    # dataclasses or asdict's deep copy of every config.
+    nodes = []
+    for nid, n in g.nodes.items():
+        x, y = positions.get(nid, DEFAULT_POS)
+        nodes.append({"id": n.id, "type_name": n.type_name, "x": x, "y": y, "config": n.config})
     payload = {
-        "nodes": [asdict(n) for n in state.nodes],
-        "edges": [asdict(e) for e in state.edges],
+        "nodes": nodes,
+        "edges": [
+            {"from_node": e.from_node, "from_port": e.from_port, "to_node": e.to_node, "to_port": e.to_port}
+            for e in g.edges
+        ],
     }
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    p.write_bytes(_dump_graph(payload))
+
+
+def _dump_graph(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # e.g. ints wider than 64 bits; json handles whatever it did before
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
+def _load_graph_data(raw: bytes) -> Dict[str, Any]:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # retried below: json also reads what the fallback above wrote
+    return json.loads(raw)
 
 
 def load_graph(path: str) -> tuple[Graph, Dict[str, Tuple[int, int]]]:
-    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    data = _load_graph_data(Path(path).read_bytes())
     nodes = [NodeState(**nd) for nd in data.get("nodes", [])]
     edges = [EdgeState(**ed) for ed in data.get("edges", [])]
     return state_to_graph(GraphState(nodes=nodes, edges=edges))